@@ -1,9 +1,27 @@
 from abc import abstractmethod
-from typing import Generic, List, Optional, TypeVar, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+import copy
+from functools import lru_cache, partial
+import multiprocessing as mp
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 from pathlib import Path
+import pickle
 import random
+import warnings
 
-from joblib import Parallel, delayed
+from joblib import Parallel, cpu_count, delayed, effective_n_jobs
 import numpy as np
 
 from discretenet.problem import Problem
@@ -11,6 +29,166 @@ from discretenet.problem import Problem
 T = TypeVar("T", bound=Problem)
 
 
+@lru_cache(maxsize=1)
+def _unordered_return_as() -> str:
+    """
+    Return the joblib ``return_as`` mode yielding results in order of completion,
+    falling back to in-order "generator" for joblib versions before 1.4
+    """
+
+    try:
+        Parallel(return_as="generator_unordered")
+    except ValueError:
+        return "generator"
+
+    return "generator_unordered"
+
+
+@lru_cache(maxsize=1)
+def _load_generator(state: bytes) -> "Generator":
+    """
+    Unpickle a generator, caching the result so that each worker process only
+    unpickles the generator once per batch rather than once per instance
+    """
+
+    return pickle.loads(state)
+
+
+def _generate_instance(
+    generator: "Generator",
+    random_seed: np.random.SeedSequence,
+    sample: Optional[Dict[str, Any]],
+    save: bool,
+    save_params: bool,
+    save_features: bool,
+    return_instances: bool,
+) -> Optional[Problem]:
+    instance = generator._generate(random_seed, sample)
+
+    if save:
+        instance.save(generator.path_prefix, params=save_params, features=save_features)
+
+    if return_instances:
+        return instance
+
+
+@lru_cache(maxsize=8)
+def _make_worker(
+    save: bool, save_params: bool, save_features: bool, return_instances: bool
+) -> Callable:
+    """
+    Return a picklable worker, called with a generator, random seed and
+    pre-sampled parameters, which generates a single instance with the given
+    save and return options
+    """
+
+    return partial(
+        _generate_instance,
+        save=save,
+        save_params=save_params,
+        save_features=save_features,
+        return_instances=return_instances,
+    )
+
+
+def _generate_from_state(
+    worker: Callable,
+    state: bytes,
+    random_seed: np.random.SeedSequence,
+    sample: Optional[Dict[str, Any]],
+) -> Optional[Problem]:
+    """
+    Worker function for process-based parallel batch generation
+
+    :param worker: The worker returned by ``_make_worker()``
+    :param state: The pickled generator, from ``pickle.dumps(generator)``
+    :param random_seed: The random seed to generate the instance with
+    :param sample: Pre-sampled parameters to pass to ``generate()``, if any
+    """
+
+    return worker(_load_generator(state), random_seed, sample)
+
+
+# The payload of the current futures pool, set in each worker by _init_worker
+_worker_payload: Any = None
+
+
+def _init_worker(payload: Any) -> None:
+    """
+    Initializer for futures worker processes, storing the payload once per worker
+
+    Forked workers inherit ``payload`` from the main process, rather than
+    receiving it with every chunk of instances.
+    """
+
+    global _worker_payload
+    _worker_payload = payload
+
+
+def _generate_from_worker(
+    func: Callable,
+    worker: Callable,
+    random_seed: np.random.SeedSequence,
+    sample: Optional[Dict[str, Any]],
+) -> Optional[Problem]:
+    """
+    Worker function for the futures backend, passing the payload set by
+    ``_init_worker()`` to ``func``
+
+    :param func: Either ``_generate_from_state`` or ``_generate_from_copy``
+    :param worker: The worker returned by ``_make_worker()``
+    :param random_seed: The random seed to generate the instance with
+    :param sample: Pre-sampled parameters to pass to ``generate()``, if any
+    """
+
+    return func(worker, _worker_payload, random_seed, sample)
+
+
+def _generate_from_copy(
+    worker: Callable,
+    generator: "Generator",
+    random_seed: np.random.SeedSequence,
+    sample: Optional[Dict[str, Any]],
+) -> Optional[Problem]:
+    """
+    Worker function for thread-based parallel batch generation
+
+    Each instance is generated on its own shallow copy of the generator, so that
+    seeding one instance does not affect the random state of other threads.
+
+    :param worker: The worker returned by ``_make_worker()``
+    :param generator: The generator, shared between threads
+    :param random_seed: The random seed to generate the instance with
+    :param sample: Pre-sampled parameters to pass to ``generate()``, if any
+    """
+
+    return worker(copy.copy(generator), random_seed, sample)
+
+
+def _generate_batch(
+    func: Callable,
+    worker: Callable,
+    payload: Any,
+    random_seeds: List[np.random.SeedSequence],
+    samples: List[Optional[Dict[str, Any]]],
+) -> List[Optional[Problem]]:
+    """
+    Generate a batch of instances within a single parallel task, so that the
+    payload is only sent to the worker once per batch
+
+    :param func: Either ``_generate_from_state`` or ``_generate_from_copy``
+    :param worker: The worker returned by ``_make_worker()``
+    :param payload: The generator or pickled generator passed to ``func``
+    :param random_seeds: The random seeds to generate instances with
+    :param samples: Pre-sampled parameters for each instance
+    """
+
+    return [
+        func(worker, payload, random_seed, sample)
+        for random_seed, sample in zip(random_seeds, samples)
+    ]
+
+
 class Generator(Generic[T]):
     """
     Abstract Base Class for generator for :class:`discretenet.problem.Problem` instances.
@@ -22,8 +200,38 @@ class Generator(Generic[T]):
 
         class MyGenerator(Generator[MyProblem]):
             ...
+
+    The bit generator underlying ``self.rng`` is set by the ``bit_generator`` class
+    attribute, PCG64 by default. Generators which draw many cheap random values may
+    set it to the faster :class:`numpy.random.SFC64`: ::
+
+        class MyGenerator(Generator[MyProblem]):
+            bit_generator = np.random.SFC64
+
+    The global Python ``random`` state is only seeded for generators which set the
+    ``_seeds_python_random`` class attribute to True.
+
+    Generators whose ``generate()`` draws no random values at all may set the
+    ``deterministic`` class attribute to True, to skip reseeding before each
+    instance during batch generation. ``self.random_seed`` is still set to a
+    distinct integer seed for each instance, so that instance names built from it
+    do not collide when saving.
+
+    To reuse the same pool of workers across several batches, use the generator as
+    a context manager: ::
+
+        with generator.parallel(n_jobs=4):
+            for _ in range(10):
+                generator(n_instances=100)
     """
 
+    bit_generator: Type[np.random.BitGenerator] = np.random.PCG64
+    deterministic: bool = False
+    _seeds_python_random: bool = False
+
+    _parallel: Optional[Parallel] = None
+    _parallel_backend: Optional[str] = None
+
     @abstractmethod
     def __init__(self, random_seed: int = 42, path_prefix: Union[str, Path] = None):
         """
@@ -45,49 +253,87 @@ class Generator(Generic[T]):
 
         self.random_seed = random_seed
         self.path_prefix = path_prefix
-        self.save_params = False
-        self.save_features = False
-        self.return_instances = True
 
         self.set_seed(random_seed)
 
-    def set_seed(self, seed=42) -> None:
+    def set_seed(self, seed: Union[int, np.random.SeedSequence] = 42) -> None:
         """
         Set the random seed for any relevant libraries (default numpy) to ensure
         reproducibility.
 
-        :param seed: The random seed to use
+        Concrete generators should draw all random values from ``self.rng``, a
+        :class:`numpy.random.Generator` using ``self.bit_generator``, seeded here.
+        The global ``np.random`` state (and the ``random`` state, if
+        ``_seeds_python_random`` is True) is also seeded for backwards compatibility
+        with generators which still rely on it, but this is deprecated.
+
+        If ``seed`` is a :class:`numpy.random.SeedSequence` (as spawned during batch
+        generation), a 64-bit integer seed is drawn from it, so that
+        ``self.random_seed`` is always an integer which reproduces ``self.rng``.
+
+        :param seed: The random seed to use, an integer or a ``SeedSequence``
         """
-        self.random_seed = seed
-        random.seed(self.random_seed)
-        np.random.seed(self.random_seed)
+        if isinstance(seed, np.random.SeedSequence):
+            seed = seed.generate_state(1, dtype=np.uint64)[0]
+
+        self.random_seed = int(seed)
+        self.rng = np.random.Generator(self.bit_generator(self.random_seed))
+        if self._seeds_python_random:
+            random.seed(self.random_seed)
+        np.random.seed(self.random_seed & 0xFFFFFFFF)
 
     @abstractmethod
     def generate(self) -> T:
         """
         Generate and return a single :class:`discretenet.problem.Problem` instance
 
+        Random values should be drawn from ``self.rng``, which is reseeded prior to
+        each instance creation during batch generation.
+
         :return: An initialized concrete ``Problem`` instance
         """
 
         pass
 
-    def _generate(self, random_seed) -> Optional[T]:
-        self.set_seed(random_seed)
-        instance = self.generate()
-
-        if self.return_instances:
-            return instance
+    def pre_sample(self, n_instances: int) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Optionally pre-sample random parameters for a whole batch of instances
+
+        Called once by ``__call__`` prior to batch generation. Generators whose random
+        parameters can be drawn with a few vectorized calls to ``self.rng`` may
+        override this to return a dictionary of arrays, each with a leading dimension
+        of ``n_instances``. Row ``i`` of every array is then passed by keyword to
+        ``generate()`` for the ``i``-th instance, which must accept these keywords
+        and should still sample them itself when they are not given. Usage: ::
+
+            class MyGenerator(Generator[MyProblem]):
+                def pre_sample(self, n_instances):
+                    return {"costs": self.rng.integers(10, size=(n_instances, 5))}
+
+                def generate(self, costs=None):
+                    if costs is None:
+                        costs = self.rng.integers(10, size=5)
+                    ...
+
+        :param n_instances: Number of instances about to be generated
+        :return: A dictionary of pre-sampled arrays, or None (default) if random
+            parameters are sampled within ``generate()``
+        """
 
-    def _generate_and_save(self, random_seed) -> T:
-        self.set_seed(random_seed)
-        instance = self.generate()
-        instance.save(
-            self.path_prefix, params=self.save_params, features=self.save_features
-        )
+        return None
 
-        if self.return_instances:
-            return instance
+    def _generate(
+        self,
+        random_seed: np.random.SeedSequence,
+        sample: Optional[Dict[str, Any]] = None,
+    ) -> T:
+        if self.deterministic:
+            # Nothing to reseed, but each instance still takes its own integer
+            # seed, which problem names are built from
+            self.random_seed = int(random_seed.generate_state(1, dtype=np.uint64)[0])
+        else:
+            self.set_seed(random_seed)
+        return self.generate(**(sample or {}))
 
     def __call__(
         self,
@@ -98,21 +344,32 @@ class Generator(Generic[T]):
         save_features=False,
         return_instances=True,
         verbosity: int = 0,
-    ) -> Optional[List[T]]:
+        return_as: str = "list",
+        backend: str = "loky",
+        save_threads: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> Optional[Union[List[T], Iterator[Optional[T]]]]:
         """
         Generate and return ``n_instances`` problem instances by calling ``generate()``
 
-        Generation is performed in parallel using ``n_jobs`` Joblib jobs with the default
-        backend. If ``n_jobs`` is 1, Joblib is not used. This may be beneficial as it
+        Generation is performed in parallel using ``n_jobs`` Joblib jobs with the given
+        ``backend``. If ``n_jobs`` is 1, Joblib is not used. This may be beneficial as it
         avoids having to pickle complex models to send them between processes, but with
         the drawback of not being able to exploit parallelism.
 
         Because forked processes have identical memory initially, all processes will
         share the same random seed. By default, this means that each set of processes
-        would generate the same set of instances. To fix this, we pre-generate
-        random seeds for every instance, and call ``self.set_seed()`` prior to each
-        instance creation. The main process retains its random state, so subsequent
-        calls to the generator will generate different instances.
+        would generate the same set of instances. To fix this, we spawn an independent
+        child :class:`numpy.random.SeedSequence` from ``self.random_seed`` for every
+        instance, and call ``self.set_seed()`` with it prior to each instance creation.
+        Each instance is seeded with its own integer seed, rather than jumping ahead
+        in a single shared stream, so that any instance can be reproduced from the
+        seed embedded in its name. Instances are always generated on a copy of the
+        generator, which is then reseeded with ``self.random_seed + 1``, so subsequent
+        calls to the generator will generate different instances. If ``pre_sample()``
+        is implemented, it is called once with ``self.rng`` before any instance is
+        generated, and each instance receives its own row of the pre-sampled
+        parameters.
 
         :param n_instances: Number of instances to create
         :param n_jobs: Number of joblib jobs to use
@@ -129,32 +386,342 @@ class Generator(Generic[T]):
             Default True.
         :param verbosity: Joblib Parallel verbosity. If nonzero, print progress updates.
             If more than 10, all iterations are reported.
+        :param return_as: One of "list" (default) or "generator". If "generator", an
+            iterator is returned which yields instances as soon as they are generated,
+            rather than holding every instance in memory. When running in parallel
+            with joblib 1.4 or later, instances are yielded in order of completion
+            rather than in order of their seeds, trading ordering for throughput.
+            If ``return_instances`` is False, None is yielded for each instance
+            instead.
+        :param backend: Parallel backend to use, one of "loky" (default), "threading"
+            or "futures". The threading backend shares the generator between threads
+            rather than pickling it to worker processes, and instances are returned
+            without pickling. This is only faster for generators which spend most of
+            their time in code that releases the GIL, and which draw random values
+            from ``self.rng`` rather than the global ``random`` or ``np.random``
+            states. The futures backend bypasses joblib and uses a
+            :class:`concurrent.futures.ProcessPoolExecutor`, sending instances to
+            workers in chunks. The pickled generator is handed to each worker once,
+            when the pool starts, rather than with every chunk. Workers are forked
+            where available, so they inherit it from the main process, whereas
+            loky always starts fresh worker processes. The futures backend has less
+            scheduling overhead than joblib for large batches of cheap instances, but
+            instances are always returned in order, and ``verbosity`` is ignored.
+        :param save_threads: If set and ``save`` is True, instances are saved by a
+            pool of ``save_threads`` threads in the main process rather than by the
+            worker which generated them, so that workers can move on to the next
+            instance while the previous one is written to disk. Instances are then
+            always sent back to the main process, even if ``return_instances`` is
+            False. Default None, saving within the workers.
+        :param batch_size: If set, instances are dispatched to workers in batches of
+            ``batch_size``, each generated within a single task. The generator is
+            then sent to workers once per batch rather than once per instance, which
+            speeds up generation of many cheap instances from a large generator.
+            Instances are sent back once their whole batch is done. For the futures
+            backend, this sets the chunk size. Default None, one task per instance.
         :return: A list of generated concrete ``Problem`` instances, or None if
-            ``return_instances`` is False.
+            ``return_instances`` is False. An iterator over the instances if
+            ``return_as`` is "generator".
+        """
+
+        if return_as not in ("list", "generator"):
+            raise ValueError(
+                f"Unrecognized return_as {return_as!r}, expected 'list' or 'generator'"
+            )
+        if backend not in ("loky", "threading", "futures"):
+            raise ValueError(
+                f"Unrecognized backend {backend!r}, "
+                "expected 'loky', 'threading' or 'futures'"
+            )
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        save_in_main = bool(save and save_threads)
+        worker = _make_worker(
+            save and not save_in_main,
+            save_params,
+            save_features,
+            return_instances or save_in_main,
+        )
+
+        instances = self._iter_instances(
+            n_instances,
+            n_jobs,
+            worker,
+            verbosity,
+            return_as == "list",
+            backend,
+            batch_size,
+        )
+
+        self.set_seed(self.random_seed + 1)
+
+        if save_in_main:
+            instances = self._iter_saved(
+                instances, save_threads, save_params, save_features, return_instances
+            )
+
+        if return_as == "generator":
+            return instances
+
+        instances = list(instances)
+
+        if return_instances:
+            return instances
+
+    def parallel(
+        self, n_jobs: int = -1, backend: str = "loky", verbosity: int = 0
+    ) -> "Generator[T]":
+        """
+        Configure a persistent pool of joblib workers, to be used as a context manager
+
+        Within the ``with`` block, every parallel call to the generator dispatches to
+        the same pool, rather than setting up a new ``Parallel`` each time. The
+        ``n_jobs`` (unless 1), ``verbosity`` and ``backend`` arguments of
+        ``__call__`` are then ignored, and streamed instances are always yielded in
+        order. Streamed instances must be consumed before the block exits.
+
+        :param n_jobs: Number of joblib jobs to use
+        :param backend: Joblib backend to use, either "loky" (default) or "threading"
+        :param verbosity: Joblib Parallel verbosity
+        :return: The generator itself, to be entered as a context manager
+        """
+
+        if backend not in ("loky", "threading"):
+            raise ValueError(
+                f"Unrecognized backend {backend!r}, expected 'loky' or 'threading'"
+            )
+
+        self._parallel = Parallel(
+            n_jobs=n_jobs,
+            backend=backend,
+            max_nbytes=None,
+            verbose=verbosity,
+            return_as="generator",
+        )
+        self._parallel_backend = backend
+        return self
+
+    def __enter__(self) -> "Generator[T]":
+        if self._parallel is None:
+            self.parallel()
+
+        self._parallel.__enter__()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        parallel = self._parallel
+        self._parallel = None
+        self._parallel_backend = None
+        parallel.__exit__(*exc_info)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The worker pool can't be sent to the workers themselves
+        state = self.__dict__.copy()
+        state.pop("_parallel", None)
+        state.pop("_parallel_backend", None)
+        return state
+
+    def _iter_instances(
+        self,
+        n_instances: int,
+        n_jobs: int,
+        worker: Callable,
+        verbosity: int,
+        ordered: bool,
+        backend: str,
+        batch_size: Optional[int],
+    ) -> Iterator[Optional[T]]:
         """
+        Return an iterator over ``n_instances`` generated instances
 
-        self.save_params = save_params
-        self.save_features = save_features
-        self.return_instances = return_instances
+        Seeds and worker state are prepared immediately, but instances are only
+        generated as the iterator is consumed.
+        """
 
-        starting_seed = self.random_seed
+        seed_seq = np.random.SeedSequence(self.random_seed)
 
-        func = self._generate_and_save if save else self._generate
-        random_states = np.random.randint(np.iinfo(np.int32).max, size=n_instances)
+        sample = self.pre_sample(n_instances)
+        if sample is None:
+            samples = [None] * n_instances
+        else:
+            samples = [
+                {key: values[i] for key, values in sample.items()}
+                for i in range(n_instances)
+            ]
 
         if n_jobs == 1:
             # When using only a single job, bypass the joblib backend entirely.
             # This saves having to use pickle, which may be slow for very large
-            # models.
-            instances = [func(random_seed) for random_seed in random_states]
-
+            # models. Child seeds are spawned lazily, one per instance, which yields
+            # the same seeds as spawning them all at once.
+            child_seeds = (seed_seq.spawn(1)[0] for _ in range(n_instances))
+            return map(partial(worker, copy.copy(self)), child_seeds, samples)
+
+        child_seeds = seed_seq.spawn(n_instances)
+
+        parallel = self._parallel
+        if parallel is not None:
+            backend = self._parallel_backend
+            n_jobs = parallel.n_jobs
+
+        if backend == "threading":
+            # Threads share memory, so the generator is passed as-is, and each
+            # task works on its own copy of it
+            func, payload = _generate_from_copy, copy.copy(self)
         else:
-            with Parallel(n_jobs=n_jobs, backend="loky", verbose=verbosity) as parallel:
-                instances = parallel(
-                    delayed(func)(random_seed) for random_seed in random_states
+            # Every worker process holds its own copy of the generator, so running
+            # more processes than CPUs costs memory without any speedup
+            n_cpus = cpu_count()
+            if effective_n_jobs(n_jobs) > n_cpus:
+                warnings.warn(
+                    f"n_jobs={n_jobs} exceeds the {n_cpus} available CPUs, "
+                    "each additional worker process only adds memory usage",
+                    RuntimeWarning,
                 )
 
-        self.set_seed(starting_seed + 1)
+            # Pickle the generator once up front rather than once per task. Joblib's
+            # memmapping of large arguments is disabled, since the only arguments
+            # are the (small) pickled generator and seeds.
+            func = _generate_from_state
+            payload = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if backend == "futures":
+            return self._iter_futures(
+                func, worker, payload, child_seeds, samples, n_jobs, batch_size
+            )
+
+        return self._iter_parallel(
+            func,
+            worker,
+            payload,
+            child_seeds,
+            samples,
+            n_jobs,
+            verbosity,
+            ordered,
+            backend,
+            batch_size,
+            parallel,
+        )
 
-        if self.return_instances:
-            return instances
+    def _iter_saved(
+        self,
+        instances: Iterator[T],
+        save_threads: int,
+        save_params: bool,
+        save_features: bool,
+        return_instances: bool,
+    ) -> Iterator[Optional[T]]:
+        """
+        Save instances from ``instances`` using a pool of ``save_threads`` threads,
+        yielding each instance (or None, if not returning instances) once its save
+        has been submitted
+        """
+
+        path_prefix = self.path_prefix
+
+        with ThreadPoolExecutor(max_workers=save_threads) as executor:
+            pending = set()
+            for instance in instances:
+                pending.add(
+                    executor.submit(
+                        instance.save,
+                        path_prefix,
+                        params=save_params,
+                        features=save_features,
+                    )
+                )
+
+                # Surface save errors early, and release finished instances
+                done = {future for future in pending if future.done()}
+                for future in done:
+                    future.result()
+                pending -= done
+
+                yield instance if return_instances else None
+
+            for future in pending:
+                future.result()
+
+    @staticmethod
+    def _iter_futures(
+        func: Callable,
+        worker: Callable,
+        payload: Any,
+        child_seeds: List[np.random.SeedSequence],
+        samples: List[Optional[Dict[str, Any]]],
+        n_jobs: int,
+        batch_size: Optional[int],
+    ) -> Iterator[Optional[Problem]]:
+        n_jobs = effective_n_jobs(n_jobs)
+        chunksize = batch_size or max(1, len(child_seeds) // (n_jobs * 4))
+
+        context = None
+        if "fork" in mp.get_all_start_methods():
+            context = mp.get_context("fork")
+
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(payload,),
+        ) as executor:
+            yield from executor.map(
+                partial(_generate_from_worker, func, worker),
+                child_seeds,
+                samples,
+                chunksize=chunksize,
+            )
+
+    @staticmethod
+    def _iter_parallel(
+        func: Callable,
+        worker: Callable,
+        payload: Any,
+        child_seeds: List[np.random.SeedSequence],
+        samples: List[Optional[Dict[str, Any]]],
+        n_jobs: int,
+        verbosity: int,
+        ordered: bool,
+        backend: str,
+        batch_size: Optional[int],
+        parallel: Optional[Parallel],
+    ) -> Iterator[Optional[Problem]]:
+        if parallel is not None:
+            context = nullcontext(parallel)
+        else:
+            context = Parallel(
+                n_jobs=n_jobs,
+                backend=backend,
+                max_nbytes=None,
+                verbose=verbosity,
+                return_as="generator" if ordered else _unordered_return_as(),
+            )
+
+        with context as parallel:
+            # Tasks are passed as a list rather than a generator, so that joblib
+            # knows the number of tasks up front when choosing how to batch them
+            if batch_size is None:
+                yield from parallel(
+                    [
+                        delayed(func)(worker, payload, child_seed, sample)
+                        for child_seed, sample in zip(child_seeds, samples)
+                    ]
+                )
+                return
+
+            batches = parallel(
+                [
+                    delayed(_generate_batch)(
+                        func,
+                        worker,
+                        payload,
+                        child_seeds[i : i + batch_size],
+                        samples[i : i + batch_size],
+                    )
+                    for i in range(0, len(child_seeds), batch_size)
+                ]
+            )
+            for batch in batches:
+                yield from batch
@@ -1,22 +1,157 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import json
+import multiprocessing as mp
 from pathlib import Path
 import pickle
-from typing import Any, Dict, Generator, Union, Type, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    Type,
+    TypeVar,
+    TYPE_CHECKING,
+)
 
 from pyomo.core.base.constraint import IndexedConstraint, _GeneralConstraintData
 from pyomo.core.expr.current import identify_variables, decompose_term
 import pyomo.environ as pyo
-import networkx as nx
 import numpy as np
-from scipy.stats import variation
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 T = TypeVar("T", bound="Problem")
 
+# File buffer size for dumping and loading pickled instances, so large models are
+# written and read in few system calls
+_PICKLE_BUFFER_SIZE = 1 << 20
+
+# Default Pyomo Virtual Sets for each kind of variable domain. Virtual sets aren't
+# hashable, so have to use lists instead of sets
+_VARIABLE_DOMAINS = [
+    (
+        "continuous",
+        [
+            pyo.Any,
+            pyo.Reals,
+            pyo.PositiveReals,
+            pyo.NonPositiveReals,
+            pyo.NegativeReals,
+            pyo.NonNegativeReals,
+            pyo.PercentFraction,
+            pyo.UnitInterval,
+        ],
+    ),
+    (
+        "integer",
+        [
+            pyo.Integers,
+            pyo.PositiveIntegers,
+            pyo.NonPositiveIntegers,
+            pyo.NegativeIntegers,
+            pyo.NonNegativeIntegers,
+        ],
+    ),
+    ("binary", [pyo.Boolean, pyo.Binary]),
+]
+
+# The Virtual Sets are global objects shared by every variable declared with
+# them, so the kind of a domain can usually be found by identity
+_VARIABLE_DOMAIN_KINDS = {
+    id(domain): kind for kind, domains in _VARIABLE_DOMAINS for domain in domains
+}
+
+
+def _mean_and_cv(values: np.ndarray) -> Tuple[float, float]:
+    """
+    Return the mean and coefficient of variation (population standard deviation
+    over the mean) of an array, or zeros if the array is empty
+
+    The standard deviation reuses the mean rather than recomputing it. As with
+    ``scipy.stats.variation``, the coefficient of variation is nan or inf if the
+    mean is zero.
+    """
+
+    if not len(values):
+        return 0.0, 0.0
+
+    values = np.asarray(values, dtype=np.float64)
+    mean = values.mean()
+    deviations = values - mean
+    std = np.sqrt(np.dot(deviations, deviations) / len(values))
+
+    return mean, std / mean
+
+
+def _degree_statistics(degrees: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Return the mean, median, coefficient of variation, and p90/p10 percentile
+    ratio of an array of node degrees, or all zeros if the array is empty
+
+    The percentiles are computed together, with a single partial sort of the
+    array.
+    """
+
+    if not len(degrees):
+        return 0.0, 0.0, 0.0, 0.0
+
+    mean, cv = _mean_and_cv(degrees)
+    p10, median, p90 = np.percentile(degrees, [10, 50, 90])
+
+    return mean, median, cv, p90 / p10
+
+
+def _statistics_by_variable_type(
+    statistic: Callable[[np.ndarray], Tuple[float, ...]],
+    values: np.ndarray,
+    masks: List[Tuple[str, Optional[np.ndarray]]],
+) -> List[Tuple[str, Tuple[float, ...]]]:
+    """
+    Apply a statistic to the values selected by each variable type mask
+
+    A mask of None selects every value, and the statistic over all values is
+    only computed once for those, as when a problem has no continuous variables.
+    """
+
+    full_result = None
+    results = []
+    for variable_type, mask in masks:
+        if mask is not None:
+            results.append((variable_type, statistic(values[mask])))
+            continue
+
+        if full_result is None:
+            full_result = statistic(values)
+
+        results.append((variable_type, full_result))
+
+    return results
+
 
 class Problem(ABC):
     model: pyo.ConcreteModel = None
 
+    #: Groups of features which can be requested from :meth:`~get_features`, in
+    #: the order their features are returned
+    feature_groups: Tuple[str, ...] = (
+        "counts",
+        "variable_degrees",
+        "constraint_degrees",
+        "variable_coefficients",
+        "constraint_coefficients",
+        "normalized_coefficients",
+        "objective",
+        "constraint_bounds",
+    )
+
     @property
     @abstractmethod
     def is_linear(self) -> bool:
@@ -48,13 +183,46 @@ class Problem(ABC):
         After initialization, the model is assumed to be immutable.
         """
 
-        # Caching for the VCG
+        # Caching for the VCG, its array form, and features. Feature groups
+        # are cached separately, so partial requests are kept across calls.
         self._variable_constraint_graph = None
+        self._vcg_arrays = None
+        self._objective_terms = None
+        self._features = None
+        self._feature_groups = {}
 
         # Cache for model block names. This significantly speeds up
         # runtime of VCG generation and feature computation (well over 1000x).
         self._name_buffer = {}
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Drop cached values when pickling, since they can be rebuilt from the model
+
+        This keeps instances small when they are returned from parallel workers,
+        or dumped, after features have been computed. The name buffer is keyed by
+        component ``id()``, so would also be invalid once unpickled.
+        """
+
+        state = self.__dict__.copy()
+        state["_variable_constraint_graph"] = None
+        state["_vcg_arrays"] = None
+        state["_objective_terms"] = None
+        state["_name_buffer"] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a pickled instance, filling in caches missing from instances
+        dumped by older versions
+        """
+
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_vcg_arrays", None)
+        self.__dict__.setdefault("_objective_terms", None)
+        self.__dict__.setdefault("_features", None)
+        self.__dict__.setdefault("_feature_groups", {})
+
     @abstractmethod
     def get_name(self) -> str:
         """
@@ -79,7 +247,11 @@ class Problem(ABC):
         """
         pass
 
-    def get_features(self) -> Dict[str, float]:
+    def get_features(
+        self,
+        path_prefix: Union[Path, str] = None,
+        groups: Optional[Iterable[str]] = None,
+    ) -> Dict[str, float]:
         """
         Return a dictionary of computed features for the problem instance
 
@@ -259,71 +431,150 @@ class Problem(ABC):
         81. ``eq_constraint_bounds_stddev``: Standard deviation of constraint bound
             for == constraints
 
+        Features are computed once, and cached on the instance. If ``path_prefix``
+        is given, features are also cached on disk, in the same ``_features.json``
+        file written by :meth:`~save`. If that file already exists, features are
+        loaded from it rather than computed, otherwise it is written. Since the
+        file is named by ``self.get_name()``, instance names must be unique for
+        this to be safe.
+
+        Features are split into the groups listed in :attr:`~feature_groups`,
+        which are computed independently: features 1-17 are ``counts``, 18-29
+        ``variable_degrees``, 30-41 ``constraint_degrees``, 42-47
+        ``variable_coefficients``, 48-53 ``constraint_coefficients``, 54-59
+        ``normalized_coefficients``, 60-77 ``objective``, and 78-81
+        ``constraint_bounds``. If only some groups are needed, pass them as
+        ``groups`` to skip computing the others. Each group is cached on the
+        instance once computed. Only the full feature set is cached on disk, so
+        ``path_prefix`` is ignored when ``groups`` is given.
+
+        :param path_prefix: Folder to cache features in, default None to only cache
+            them in memory
+        :param groups: Names of the feature groups to return, or the name of a
+            single group, default None for all features
         :return: A dictionary of computed features
         """
+
+        if isinstance(groups, str):
+            groups = (groups,)
+
+        if groups is not None:
+            return self._get_feature_groups(groups)
+
+        filename = None
+        if path_prefix is not None:
+            filename = Path(
+                self.__build_full_path(".json", path_prefix, extra_params="_features")
+            )
+
+        if self._features is None and filename is not None and filename.exists():
+            with open(filename) as fd:
+                self._features = json.load(fd)
+
+        if self._features is None:
+            self._features = self._compute_features()
+
+        if filename is not None and not filename.exists():
+            with open(filename, "w+") as fd:
+                json.dump(self._features, fd)
+
+        return dict(self._features)
+
+    def _compute_features(self) -> Dict[str, float]:
+        """
+        Compute the features returned by :meth:`~get_features`, for all groups
+        """
+
+        return self._get_feature_groups(self.feature_groups)
+
+    def _get_feature_groups(self, groups: Iterable[str]) -> Dict[str, float]:
+        """
+        Return the features in the given groups, computing and caching each group
+        the first time it is requested
+
+        :param groups: Names of feature groups, from :attr:`~feature_groups`
+        :return: A dictionary of the features in the groups
+        """
+
         features: Dict[str, float] = {}
-        vcg = self.get_variable_constraint_graph()
+        for group in groups:
+            if group not in self.feature_groups:
+                raise ValueError(
+                    f"Unknown feature group {group}, must be one of "
+                    f"{', '.join(self.feature_groups)}"
+                )
 
-        variable_nodes = [
-            (name, data)
-            for name, data in vcg.nodes(data=True)
-            if data["type"] == "variable"
-        ]
+            if group not in self._feature_groups:
+                compute = getattr(self, f"_compute_{group}_features")
+                self._feature_groups[group] = compute(self._get_vcg_arrays())
 
-        continuous_variable_nodes = [
-            (name, data)
-            for name, data in variable_nodes
-            if data["domain"] == "continuous"
-        ]
-        non_continuous_variable_nodes = [
-            (name, data)
-            for name, data in variable_nodes
-            if data["domain"] != "continuous"
-        ]
+            features.update(self._feature_groups[group])
 
-        constraint_nodes = [
-            (name, data)
-            for name, data in vcg.nodes(data=True)
-            if data["type"] == "constraint"
-        ]
+        return features
 
-        features["num_variables"] = len(variable_nodes)
-        features["num_constraints"] = len(constraint_nodes)
-        features["num_inequality_constraints"] = len(
-            [name for name, data in constraint_nodes if data["kind"] == "leq"]
-        )
-        features["num_equality_constraints"] = len(
-            [name for name, data in constraint_nodes if data["kind"] == "eq"]
-        )
-        features["num_linear_constraints"] = len(
-            [name for name, data in constraint_nodes if data["is_linear"]]
-        )
-        features["num_nonlinear_constraints"] = len(
-            [name for name, data in constraint_nodes if not data["is_linear"]]
-        )
+    @staticmethod
+    def _get_variable_masks(
+        vcg: Dict[str, Any],
+    ) -> List[Tuple[str, Optional[np.ndarray]]]:
+        """
+        Return boolean masks over the VCG variable nodes selecting all, only
+        continuous, and only non-continuous variables
 
-        features["num_vcg_edges"] = len(vcg.edges)
-        features["num_linear_vcg_edges"] = len(
-            [1 for n1, n2, data in vcg.edges(data=True) if data["is_linear"]]
-        )
-        features["num_nonlinear_vcg_edges"] = len(
-            [1 for n1, n2, data in vcg.edges(data=True) if not data["is_linear"]]
-        )
-        features["num_binary_variables"] = len(
-            [
-                name
-                for name, data in vcg.nodes(data=True)
-                if (data["type"] == "variable" and data["domain"] == "binary")
-            ]
-        )
-        features["num_integer_variables"] = len(
-            [
-                name
-                for name, data in vcg.nodes(data=True)
-                if (data["type"] == "variable" and data["domain"] == "integer")
-            ]
+        Masks which would select every variable are None instead, so statistics
+        over them can be shared with the statistics over all variables.
+        """
+
+        continuous_variables = vcg["variable_domain"] == "continuous"
+        num_continuous_variables = int(continuous_variables.sum())
+
+        masks = [("all", None)]
+        for variable_type, mask, num_selected in [
+            ("continuous", continuous_variables, num_continuous_variables),
+            (
+                "non_continuous",
+                ~continuous_variables,
+                len(continuous_variables) - num_continuous_variables,
+            ),
+        ]:
+            if num_selected == len(continuous_variables):
+                mask = None
+
+            masks.append((variable_type, mask))
+
+        return masks
+
+    def _compute_counts_features(self, vcg: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Compute the variable, constraint, and edge count features
+        """
+
+        features: Dict[str, float] = {}
+
+        variable_domain = vcg["variable_domain"]
+        constraint_kind = vcg["constraint_kind"]
+        edge_is_linear = vcg["edge_is_linear"]
+
+        num_variables = len(variable_domain)
+        num_constraints = len(constraint_kind)
+        num_linear_constraints = int(vcg["constraint_is_linear"].sum())
+
+        features["num_variables"] = num_variables
+        features["num_constraints"] = num_constraints
+        features["num_inequality_constraints"] = int((constraint_kind == "leq").sum())
+        features["num_equality_constraints"] = int((constraint_kind == "eq").sum())
+        features["num_linear_constraints"] = num_linear_constraints
+        features["num_nonlinear_constraints"] = num_constraints - num_linear_constraints
+
+        num_edges = len(edge_is_linear)
+        num_linear_edges = int(edge_is_linear.sum())
+        features["num_vcg_edges"] = num_edges
+        features["num_linear_vcg_edges"] = num_linear_edges
+        features["num_nonlinear_vcg_edges"] = num_edges - num_linear_edges
+        features["num_binary_variables"] = int((variable_domain == "binary").sum())
+        features["num_integer_variables"] = int((variable_domain == "integer").sum())
+        features["num_continuous_variables"] = int(
+            (variable_domain == "continuous").sum()
         )
-        features["num_continuous_variables"] = len(continuous_variable_nodes)
         features["num_non_continuous_variables"] = (
             features["num_binary_variables"] + features["num_integer_variables"]
         )
@@ -341,218 +592,219 @@ class Problem(ABC):
             features["num_non_continuous_variables"] / features["num_variables"]
         )
 
+        return features
+
+    def _compute_variable_degrees_features(
+        self, vcg: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Compute the VCG variable node degree features
+        """
+
+        features: Dict[str, float] = {}
+
         # VCG Variable Node Degree Statistics - computed with respect to
         # all, only continuous, and only non-continuous variables
-        for variable_type, nodes in [
-            ("all", variable_nodes),
-            ("continuous", continuous_variable_nodes),
-            ("non_continuous", non_continuous_variable_nodes),
-        ]:
-            degrees = []
-            for node_name, _ in nodes:
-                degrees.append(vcg.degree[node_name])
+        for variable_type, statistics in _statistics_by_variable_type(
+            _degree_statistics, vcg["variable_degree"], self._get_variable_masks(vcg)
+        ):
 
             if variable_type == "all":
                 feature_prefix = "vcg_variable_node_degree"
             else:
                 feature_prefix = f"vcg_{variable_type}_variable_node_degree"
 
-            if degrees:
-                features[f"{feature_prefix}_mean"] = np.mean(degrees)
-                features[f"{feature_prefix}_median"] = np.median(degrees)
-                features[f"{feature_prefix}_cv"] = variation(degrees)
-                features[f"{feature_prefix}_p90p10"] = np.percentile(
-                    degrees, 90
-                ) / np.percentile(degrees, 10)
-            else:
-                features[f"{feature_prefix}_mean"] = 0.0
-                features[f"{feature_prefix}_median"] = 0.0
-                features[f"{feature_prefix}_cv"] = 0.0
-                features[f"{feature_prefix}_p90p10"] = 0.0
+            (
+                features[f"{feature_prefix}_mean"],
+                features[f"{feature_prefix}_median"],
+                features[f"{feature_prefix}_cv"],
+                features[f"{feature_prefix}_p90p10"],
+            ) = statistics
 
-        # VCG Constraint Node Degree Statistics - computed with respect to
-        # all, only continuous, and only non-continuous variables. This is
-        # a bit trickier than above, since we have to actually copy the graph
-        # and remove nodes. Note that equality constraints are single nodes,
-        # the problem is not in standard form.
-        for variable_type, nodes_to_remove in [
-            ("all", []),
-            ("continuous", non_continuous_variable_nodes),
-            ("non_continuous", continuous_variable_nodes),
-        ]:
-            vcg_copy = vcg.copy()
-            nodes = [node_name for node_name, _ in nodes_to_remove]
-            vcg_copy.remove_nodes_from(nodes)
+        return features
 
-            remaining_variable_nodes = [
-                node_name
-                for node_name, data in vcg_copy.nodes(data=True)
-                if data["type"] == "variable"
-            ]
+    def _compute_constraint_degrees_features(
+        self, vcg: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Compute the VCG constraint node degree features
+        """
+
+        features: Dict[str, float] = {}
 
-            degrees = []
-            for node_name in remaining_variable_nodes:
-                degrees.append(vcg_copy.degree[node_name])
+        # VCG Constraint Node Degree Statistics - computed with respect to
+        # all, only continuous, and only non-continuous variables, by taking
+        # the degrees of the variable nodes remaining in the VCG once the other
+        # variable nodes are removed. Since the VCG is bipartite, removing
+        # variable nodes does not change the degrees of the remaining ones.
+        # Note that equality constraints are single nodes, the problem is not
+        # in standard form.
+        for variable_type, statistics in _statistics_by_variable_type(
+            _degree_statistics, vcg["variable_degree"], self._get_variable_masks(vcg)
+        ):
 
             if variable_type == "all":
                 feature_prefix = "vcg_constraint_node_degree"
             else:
                 feature_prefix = f"vcg_{variable_type}_constraint_node_degree"
 
-            if degrees:
-                features[f"{feature_prefix}_mean"] = np.mean(degrees)
-                features[f"{feature_prefix}_median"] = np.median(degrees)
-                features[f"{feature_prefix}_cv"] = variation(degrees)
-                features[f"{feature_prefix}_p90p10"] = np.percentile(
-                    degrees, 90
-                ) / np.percentile(degrees, 10)
-            else:
-                features[f"{feature_prefix}_mean"] = 0.0
-                features[f"{feature_prefix}_median"] = 0.0
-                features[f"{feature_prefix}_cv"] = 0.0
-                features[f"{feature_prefix}_p90p10"] = 0.0
+            (
+                features[f"{feature_prefix}_mean"],
+                features[f"{feature_prefix}_median"],
+                features[f"{feature_prefix}_cv"],
+                features[f"{feature_prefix}_p90p10"],
+            ) = statistics
+
+        return features
+
+    def _compute_variable_coefficients_features(
+        self, vcg: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Compute the variable coefficient sum features
+        """
+
+        features: Dict[str, float] = {}
+
+        # Coefficient sums only include edges in linear constraints
+        edge_is_linear = vcg["edge_is_linear"]
+        variable_coefficient_sums = np.bincount(
+            vcg["edge_variable"][edge_is_linear],
+            weights=vcg["edge_coeff"][edge_is_linear],
+            minlength=len(vcg["variable_domain"]),
+        )
 
         # Variable coefficient statistics
-        for variable_type, nodes in [
-            ("all", variable_nodes),
-            ("continuous", continuous_variable_nodes),
-            ("non_continuous", non_continuous_variable_nodes),
-        ]:
-            coefficient_sums = []
-            for node_name, _ in nodes:
-                coeff_sum = 0.0
-                for var_node, constr_node, data in vcg.edges([node_name], data=True):
-                    if data["is_linear"]:
-                        coeff_sum += data["coeff"]
-                coefficient_sums.append(coeff_sum)
+        for variable_type, statistics in _statistics_by_variable_type(
+            _mean_and_cv, variable_coefficient_sums, self._get_variable_masks(vcg)
+        ):
 
             if variable_type == "all":
                 feature_prefix = "variable_coefficient_sum"
             else:
                 feature_prefix = f"{variable_type}_variable_coefficient_sum"
 
-            if coefficient_sums:
-                features[f"{feature_prefix}_mean"] = np.mean(coefficient_sums)
-                features[f"{feature_prefix}_cv"] = variation(coefficient_sums)
-            else:
-                features[f"{feature_prefix}_mean"] = 0.0
-                features[f"{feature_prefix}_cv"] = 0.0
+            (
+                features[f"{feature_prefix}_mean"],
+                features[f"{feature_prefix}_cv"],
+            ) = statistics
 
-        # Constraint coefficient statistics - only for linear constraints
-        for variable_type, nodes_to_remove in [
-            ("all", []),
-            ("continuous", non_continuous_variable_nodes),
-            ("non_continuous", continuous_variable_nodes),
-        ]:
-            vcg_copy = vcg.copy()
-            nodes = [node_name for node_name, _ in nodes_to_remove]
-            vcg_copy.remove_nodes_from(nodes)
+        return features
 
-            coefficient_sums = []
-            for node_name, node_data in vcg.nodes(data=True):
-                if node_data["type"] != "constraint":
-                    continue
+    def _compute_constraint_coefficients_features(
+        self, vcg: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Compute the constraint coefficient sum features
+        """
+
+        features: Dict[str, float] = {}
 
-                coeff_sum = 0.0
-                for constr_node, var_node, data in vcg.edges([node_name], data=True):
-                    if data["is_linear"]:
-                        coeff_sum += data["coeff"]
+        edge_is_linear = vcg["edge_is_linear"]
+        constraint_coefficient_sums = np.bincount(
+            vcg["edge_constraint"][edge_is_linear],
+            weights=vcg["edge_coeff"][edge_is_linear],
+            minlength=len(vcg["constraint_kind"]),
+        )
 
-                coefficient_sums.append(coeff_sum)
+        # Constraint coefficient statistics - only for linear constraints. Sums
+        # are taken over all variables in the constraint, for each variable type.
+        for variable_type in ["all", "continuous", "non_continuous"]:
+            coefficient_sums = constraint_coefficient_sums
 
             if variable_type == "all":
                 feature_prefix = "constraint_coefficient_sum"
             else:
                 feature_prefix = f"{variable_type}_constraint_coefficient_sum"
 
-            if coefficient_sums:
-                features[f"{feature_prefix}_mean"] = np.mean(coefficient_sums)
-                features[f"{feature_prefix}_cv"] = variation(coefficient_sums)
-            else:
-                features[f"{feature_prefix}_mean"] = 0.0
-                features[f"{feature_prefix}_cv"] = 0.0
+            (
+                features[f"{feature_prefix}_mean"],
+                features[f"{feature_prefix}_cv"],
+            ) = _mean_and_cv(coefficient_sums)
 
-        # Distribution of normalized constraint variable coefficients
-        for variable_type, nodes in [
-            ("all", variable_nodes),
-            ("continuous", continuous_variable_nodes),
-            ("non_continuous", non_continuous_variable_nodes),
-        ]:
+        return features
+
+    def _compute_normalized_coefficients_features(
+        self, vcg: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Compute the normalized constraint coefficient features
+        """
+
+        features: Dict[str, float] = {}
+
+        # Distribution of normalized constraint variable coefficients, over the
+        # edges of linear constraints with a nonzero bound
+        edge_bounds = vcg["constraint_bound"][vcg["edge_constraint"]]
+        normalized_edges = vcg["edge_is_linear"] & (edge_bounds != 0)
+        normalized_coeffs = (
+            vcg["edge_coeff"][normalized_edges] / edge_bounds[normalized_edges]
+        )
+        normalized_cols = vcg["edge_variable"][normalized_edges]
+
+        coefficient_masks = [
+            (variable_type, None if mask is None else mask[normalized_cols])
+            for variable_type, mask in self._get_variable_masks(vcg)
+        ]
+        for variable_type, statistics in _statistics_by_variable_type(
+            _mean_and_cv, normalized_coeffs, coefficient_masks
+        ):
             if variable_type == "all":
                 feature_prefix = "normalized_constraint_coefficient"
             else:
                 feature_prefix = f"{variable_type}_normalized_constraint_coefficient"
 
-            normalized_coeffs = []
+            (
+                features[f"{feature_prefix}_mean"],
+                features[f"{feature_prefix}_cv"],
+            ) = statistics
 
-            for node_name, _ in nodes:
-                for var_node_name, constraint_node_name, data in vcg.edges(
-                    [node_name], data=True
-                ):
-                    if not data["is_linear"]:
-                        continue
+        return features
 
-                    constraint_bound = vcg.nodes[constraint_node_name]["rhs"]
+    def _compute_objective_features(self, vcg: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Compute the objective function coefficient features
+        """
 
-                    if constraint_bound == 0:
-                        continue
+        features: Dict[str, float] = {}
+        variable_degrees = vcg["variable_degree"]
+        variable_index = {name: i for i, name in enumerate(vcg["variable_names"])}
 
-                    normalized_coeffs.append(data["coeff"] / constraint_bound)
+        # Objective function features
+        is_objective_linear, objective_var_list = self._get_objective_terms()
 
-            if normalized_coeffs:
-                features[f"{feature_prefix}_mean"] = np.mean(normalized_coeffs)
-                features[f"{feature_prefix}_cv"] = variation(normalized_coeffs)
-            else:
-                features[f"{feature_prefix}_mean"] = 0.0
-                features[f"{feature_prefix}_cv"] = 0.0
+        # Absolute coefficients and VCG degrees of the objective terms, as arrays.
+        # Every objective variable is in the VCG, so domains are read from there.
+        objective_coeffs = []
+        objective_variables = []
+        if is_objective_linear:
+            for coeff, var in objective_var_list:
+                if var is None:
+                    continue
 
-        # Objective function features
-        is_objective_linear, objective_var_list = decompose_term(
-            self.model.objective.expr
-        )
+                objective_coeffs.append(abs(coeff))
+                objective_variables.append(
+                    variable_index[self._get_component_name(var)]
+                )
 
-        objective_coefficients = (
-            [
-                (abs(coeff), var.getname(name_buffer=self._name_buffer))
-                for coeff, var in objective_var_list
-                if var is not None
-            ]
-            if is_objective_linear
-            else []
-        )
-        continuous_objective_coefficients = (
-            [
-                (abs(coeff), var.getname(name_buffer=self._name_buffer))
-                for coeff, var in objective_var_list
-                if var is not None and self._get_variable_domain(var) == "continuous"
-            ]
-            if is_objective_linear
-            else []
-        )
-        non_continuous_objective_coefficients = (
-            [
-                (abs(coeff), var.getname(name_buffer=self._name_buffer))
-                for coeff, var in objective_var_list
-                if var is not None and self._get_variable_domain(var) != "continuous"
-            ]
-            if is_objective_linear
-            else []
-        )
+        all_coeffs = np.array(objective_coeffs, dtype=np.float64)
+        all_variables = np.array(objective_variables, dtype=np.intp)
+        all_degrees = variable_degrees[all_variables]
+        continuous = vcg["variable_domain"][all_variables] == "continuous"
+        objective_terms = [
+            ("all", all_coeffs, all_degrees),
+            ("continuous", all_coeffs[continuous], all_degrees[continuous]),
+            ("non_continuous", all_coeffs[~continuous], all_degrees[~continuous]),
+        ]
 
         # Absolute objective function coefficients
-        for variable_type, coeff_data in [
-            ("all", objective_coefficients),
-            ("continuous", continuous_objective_coefficients),
-            ("non_continuous", non_continuous_objective_coefficients),
-        ]:
+        for variable_type, coeffs, _ in objective_terms:
             if variable_type == "all":
                 feature_prefix = "abs_objective_function_coefficients"
             else:
                 feature_prefix = f"abs_objective_function_{variable_type}_coefficients"
 
-            coeffs = [coeff for coeff, var in coeff_data]
-
-            if coeffs:
+            if len(coeffs):
                 features[f"{feature_prefix}_mean"] = float(np.mean(coeffs))
                 features[f"{feature_prefix}_stddev"] = float(np.std(coeffs))
             else:
@@ -561,11 +813,7 @@ class Problem(ABC):
 
         # Normalized absolute objective function coefficients
         # Normalized by the number of constraints each variable participates in
-        for variable_type, coeff_data in [
-            ("all", objective_coefficients),
-            ("continuous", continuous_objective_coefficients),
-            ("non_continuous", non_continuous_objective_coefficients),
-        ]:
+        for variable_type, coeffs, degrees in objective_terms:
             if variable_type == "all":
                 feature_prefix = "normalized_abs_objective_function_coefficients"
             else:
@@ -573,15 +821,10 @@ class Problem(ABC):
                     f"normalized_abs_objective_function_{variable_type}_coefficients"
                 )
 
-            coeffs = []
-            for coeff, var_name in coeff_data:
-                num_constraints = len(vcg.edges([var_name]))
-                if num_constraints == 0:
-                    continue
+            constrained = degrees != 0
+            coeffs = coeffs[constrained] / degrees[constrained]
 
-                coeffs.append(coeff / num_constraints)
-
-            if coeffs:
+            if len(coeffs):
                 features[f"{feature_prefix}_mean"] = float(np.mean(coeffs))
                 features[f"{feature_prefix}_stddev"] = float(np.std(coeffs))
             else:
@@ -589,11 +832,7 @@ class Problem(ABC):
                 features[f"{feature_prefix}_stddev"] = 0.0
 
         # Square root normalized absolute objective function coefficients
-        for variable_type, coeff_data in [
-            ("all", objective_coefficients),
-            ("continuous", continuous_objective_coefficients),
-            ("non_continuous", non_continuous_objective_coefficients),
-        ]:
+        for variable_type, coeffs, degrees in objective_terms:
             if variable_type == "all":
                 feature_prefix = "sqrt_normalized_abs_objective_function_coefficients"
             else:
@@ -602,37 +841,40 @@ class Problem(ABC):
                     "_coefficients"
                 )
 
-            coeffs = []
-            for coeff, var_name in coeff_data:
-                num_constraints = len(vcg.edges([var_name]))
-                if num_constraints == 0:
-                    continue
-
-                coeffs.append(coeff / np.sqrt(num_constraints))
+            constrained = degrees != 0
+            coeffs = coeffs[constrained] / np.sqrt(degrees[constrained])
 
-            if coeffs:
+            if len(coeffs):
                 features[f"{feature_prefix}_mean"] = float(np.mean(coeffs))
                 features[f"{feature_prefix}_stddev"] = float(np.std(coeffs))
             else:
                 features[f"{feature_prefix}_mean"] = 0.0
                 features[f"{feature_prefix}_stddev"] = 0.0
 
-        # Constraint bound features
-        leq_constraint_bounds = [
-            data["rhs"] for name, data in constraint_nodes if data["kind"] == "leq"
-        ]
-        eq_constraint_bounds = [
-            data["rhs"] for name, data in constraint_nodes if data["kind"] == "eq"
-        ]
+        return features
+
+    def _compute_constraint_bounds_features(
+        self, vcg: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Compute the constraint bound features
+        """
 
-        if leq_constraint_bounds:
+        features: Dict[str, float] = {}
+
+        constraint_kind = vcg["constraint_kind"]
+        leq_constraint_bounds = vcg["constraint_bound"][constraint_kind == "leq"]
+        eq_constraint_bounds = vcg["constraint_bound"][constraint_kind == "eq"]
+
+        # Constraint bound features
+        if len(leq_constraint_bounds):
             features["leq_constraint_bounds_mean"] = np.mean(leq_constraint_bounds)
             features["leq_constraint_bounds_stddev"] = np.std(leq_constraint_bounds)
         else:
             features["leq_constraint_bounds_mean"] = 0.0
             features["leq_constraint_bounds_stddev"] = 0.0
 
-        if eq_constraint_bounds:
+        if len(eq_constraint_bounds):
             features["eq_constraint_bounds_mean"] = np.mean(eq_constraint_bounds)
             features["eq_constraint_bonds_stddev"] = np.std(eq_constraint_bounds)
         else:
@@ -654,32 +896,15 @@ class Problem(ABC):
         """
         domain = var.domain
 
-        # Virtual sets aren't hashable, so have to use lists instead of sets
-        continuous_domains = [
-            pyo.Any,
-            pyo.Reals,
-            pyo.PositiveReals,
-            pyo.NonPositiveReals,
-            pyo.NegativeReals,
-            pyo.NonNegativeReals,
-            pyo.PercentFraction,
-            pyo.UnitInterval,
-        ]
-        integer_domains = [
-            pyo.Integers,
-            pyo.PositiveIntegers,
-            pyo.NonPositiveIntegers,
-            pyo.NegativeIntegers,
-            pyo.NonNegativeIntegers,
-        ]
-        binary_domains = [pyo.Boolean, pyo.Binary]
+        kind = _VARIABLE_DOMAIN_KINDS.get(id(domain))
+        if kind is not None:
+            return kind
 
-        if domain in continuous_domains:
-            return "continuous"
-        elif domain in integer_domains:
-            return "integer"
-        elif domain in binary_domains:
-            return "binary"
+        # Fall back to comparing against each set, for domains which are equal
+        # to one of the default Virtual Sets without being the same object
+        for kind, domains in _VARIABLE_DOMAINS:
+            if domain in domains:
+                return kind
 
         raise ValueError("Unrecognized variable domain")
 
@@ -709,7 +934,44 @@ class Problem(ABC):
                 for idx in x:
                     yield x[idx]
 
-    def get_variable_constraint_graph(self) -> nx.Graph:
+    def _get_component_name(self, component: Any) -> str:
+        """
+        Return the name of a model component, such as a variable or constraint
+
+        Names are looked up in the name buffer first, and added to it once built.
+        Pyomo only buffers the names of indexed components itself, so this also
+        avoids rebuilding the names of scalar components, which are requested
+        once per constraint or objective term they appear in.
+
+        :param component: Pyomo component or component data
+        :return: Name of the component
+        """
+
+        name = self._name_buffer.get(id(component))
+        if name is None:
+            name = component.getname(name_buffer=self._name_buffer)
+            self._name_buffer[id(component)] = name
+
+        return name
+
+    def _get_objective_terms(self) -> Tuple[bool, List[Tuple[float, pyo.Var]]]:
+        """
+        Return the decomposed objective function, as given by Pyomo's
+        ``decompose_term``: whether the objective is linear, and a list of
+        (coefficient, variable) terms, where the variable of a constant term is
+        None
+
+        The objective expression is only walked once, and the result cached on
+        the instance, since the model is assumed to be immutable. This can't be
+        done in :meth:`~__init__`, as subclasses build the model after calling it.
+        """
+
+        if self._objective_terms is None:
+            self._objective_terms = decompose_term(self.model.objective.expr)
+
+        return self._objective_terms
+
+    def get_variable_constraint_graph(self) -> "nx.Graph":
         """
         Construct a bipartite Variable Constraint Graph of the problem instance
 
@@ -720,7 +982,7 @@ class Problem(ABC):
         Variable nodes have the following attributes:
         - ``type``: "variable"
         - ``domain``: One of "continuous", "integer", or "binary"
-        - ``objcoeff``: The coefficient of the variable in the objective function.
+        - ``obj_coeff``: The coefficient of the variable in the objective function.
           Only present the objective is linear and the variable participates in it.
 
         Constraint nodes have the following attributes:
@@ -729,6 +991,7 @@ class Problem(ABC):
         - ``original_kind``: One of "leq", "geq", or "eq" indicating whether the
           constraint was <=, >=, or == prior to being transformed to one of <= or ==
         - ``is_linear``: Whether the constraint is linear
+        - ``bound``: The bound of the constraint, once in <= or == form
 
         Edges have the following attributes:
         - ``is_liner``: Whether the corresponding constraint is linear
@@ -750,7 +1013,7 @@ class Problem(ABC):
         creating a new Pyomo Set.
 
         If the objective function is linear, variables which participate in the
-        objective function have their objective coefficient in the ``objcoeff``
+        objective function have their objective coefficient in the ``obj_coeff``
         node attribute. Since objectives can be minimized or maximized, the
         objective is converted to minimizing sense for the VCG, and objective
         coefficients negated as necessary.
@@ -761,25 +1024,66 @@ class Problem(ABC):
         if self._variable_constraint_graph is not None:
             return self._variable_constraint_graph
 
+        # NetworkX is only imported once a graph is needed, since features are
+        # computed without it
+        import networkx as nx
+
+        nodes, edges = self._collect_vcg_elements()
+
         G = nx.Graph()
+        G.add_nodes_from(nodes)
+        G.add_edges_from((u, v, data) for (u, v), data in edges.items())
+
+        self._variable_constraint_graph = G
+
+        return G
+
+    def _collect_vcg_elements(
+        self,
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], Dict[Tuple[str, str], Dict[str, Any]]]:
+        """
+        Walk the model constraints and objective, and collect the nodes and edges
+        of the Variable Constraint Graph, with the attributes described in
+        :meth:`~get_variable_constraint_graph`
+
+        Nodes are returned as a list of (name, attributes) pairs, and edges as a
+        dict mapping (constraint name, variable name) to attributes, both in the
+        order they are found. This is the order NetworkX would keep if the graph
+        were built one node and edge at a time.
+
+        :return: VCG nodes and edges
+        """
+
+        # Variable nodes are only emitted once, the first time the variable is
+        # found. As with adding an edge to a graph, an edge found twice keeps its
+        # position and takes the later attributes.
+        nodes = []
+        edges: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        variable_nodes: Dict[str, Dict[str, Any]] = {}
 
         for constr in self.__yield_constraints():
-            constr_name = constr.getname(name_buffer=self._name_buffer)
+            constr_name = self._get_component_name(constr)
             is_linear, var_list = decompose_term(constr.body)
 
-            # All constraints in the VCG will either be <= or == bounded
-            if constr.has_lb() and not constr.has_ub():  # constr >= b
+            # All constraints in the VCG will either be <= or == bounded. Each
+            # bound accessor evaluates the bound, so they are only called once.
+            has_lb = constr.has_lb()
+            has_ub = constr.has_ub()
+            lower = constr.lower() if has_lb else None
+            upper = constr.upper() if has_ub else None
+
+            if has_lb and not has_ub:  # constr >= b
                 multiplier = -1
-                rhs = constr.lower()
+                rhs = lower
                 kind = "leq"
                 original_kind = "geq"
-            elif not constr.has_lb() and constr.has_ub():  # constr <= b
+            elif not has_lb and has_ub:  # constr <= b
                 multiplier = 1
-                rhs  = constr.upper()
+                rhs = upper
                 kind = original_kind = "leq"
-            elif constr.lower() == constr.upper():  # constr == b
+            elif lower == upper:  # constr == b
                 multiplier = 1
-                rhs = constr.upper()
+                rhs = upper
                 kind = original_kind = "eq"
             else:
                 # lb <= constr <= ub
@@ -789,53 +1093,47 @@ class Problem(ABC):
 
             rhs *= multiplier
 
-            G.add_node(
-                constr_name,
-                type="constraint",
-                kind=kind,
-                original_kind=original_kind,
-                is_linear=is_linear,
-            )
+            constr_data = {
+                "type": "constraint",
+                "kind": kind,
+                "original_kind": original_kind,
+                "is_linear": is_linear,
+            }
+            nodes.append((constr_name, constr_data))
 
             if not is_linear:
                 # Pyomo currently doesn't support extracting coefficients
                 # for nonlinear constraints
-                for var in identify_variables(constr.body):
-                    var_name = var.getname(name_buffer=self._name_buffer)
-                    # Graph nodes are sets, so this is fine
-                    G.add_node(
-                        var_name,
-                        type="variable",
-                        domain=self._get_variable_domain(var),
-                    )
+                var_list = [(None, var) for var in identify_variables(constr.body)]
 
-                    # No coeff attribute for non-linear constraints
-                    G.add_edge(constr_name, var_name, is_linear=False)
-            else:
-                var: pyo.Var
-                for coeff, var in var_list:
-                    if var is None:
-                        # Constant term - subtract from rhs
-                        rhs -= coeff * multiplier
-                        continue
-
-                    var_name = var.getname(name_buffer=self._name_buffer)
-
-                    G.add_node(
-                        var_name,
-                        type="variable",
-                        domain=self._get_variable_domain(var),
-                    )
+            var: pyo.Var
+            for coeff, var in var_list:
+                if var is None:
+                    # Constant term - subtract from rhs
+                    rhs -= coeff * multiplier
+                    continue
+
+                var_name = self._get_component_name(var)
 
-                    G.add_edge(constr_name, var_name, is_linear=True, coeff=coeff)
+                if var_name not in variable_nodes:
+                    var_data = {
+                        "type": "variable",
+                        "domain": self._get_variable_domain(var),
+                    }
+                    variable_nodes[var_name] = var_data
+                    nodes.append((var_name, var_data))
+
+                if is_linear:
+                    edges[constr_name, var_name] = {"is_linear": True, "coeff": coeff}
+                else:
+                    # No coeff attribute for non-linear constraints
+                    edges[constr_name, var_name] = {"is_linear": False}
 
             # Add attributes to the constraint node
-            G.nodes[constr_name]["rhs"] = rhs
+            constr_data["bound"] = rhs
 
         # Tag variable nodes with their coefficient in the objective
-        is_objective_linear, objective_var_list = decompose_term(
-            self.model.objective.expr
-        )
+        is_objective_linear, objective_var_list = self._get_objective_terms()
         objective_multiplier = 1 if self.model.objective.is_minimizing() else -1
 
         if is_objective_linear:
@@ -844,21 +1142,110 @@ class Problem(ABC):
                     # It's technically possible to add a constant term to the objective
                     continue
 
-                var_name = var.getname(name_buffer=self._name_buffer)
+                var_name = self._get_component_name(var)
 
                 # If the variable is not in the VCG by now, that means it was never
                 # part of a constraint
-                if var_name not in G.nodes:
+                if var_name not in variable_nodes:
                     raise ValueError(
                         f"Variable {var_name} appears in the objective "
                         "function without participating in any constraints"
                     )
 
-                G.nodes[var_name]["objcoeff"] = coeff * objective_multiplier
+                variable_nodes[var_name]["obj_coeff"] = coeff * objective_multiplier
 
-        self._variable_constraint_graph = G
+        return nodes, edges
 
-        return G
+    def _get_vcg_arrays(self) -> Dict[str, Any]:
+        """
+        Return the Variable Constraint Graph as flat NumPy arrays
+
+        Nodes of each type are numbered in VCG order, and node and edge
+        attributes are stored as one array per attribute, so features can be
+        computed with vectorized operations rather than by walking the graph.
+        The arrays are built once, and cached on the instance. If the graph from
+        :meth:`~get_variable_constraint_graph` has not been built yet, they are
+        built from the model directly, without creating a NetworkX graph.
+
+        Returned keys:
+        - ``variable_names``: List of variable node names
+        - ``variable_domain``: Domain of each variable node
+        - ``constraint_kind``: Kind of each constraint node, "leq" or "eq"
+        - ``constraint_bound``: Bound of each constraint node
+        - ``constraint_is_linear``: Whether each constraint node is linear
+        - ``edge_constraint``: Constraint node index of each edge
+        - ``edge_variable``: Variable node index of each edge
+        - ``edge_is_linear``: Whether each edge is in a linear constraint
+        - ``edge_coeff``: Coefficient of each edge, zero for nonlinear edges
+        - ``variable_degree``: Degree of each variable node
+
+        :return: A dictionary of VCG arrays
+        """
+
+        if self._vcg_arrays is not None:
+            return self._vcg_arrays
+
+        # Reuse the graph if it has been built, otherwise collect its nodes and
+        # edges without building it
+        if self._variable_constraint_graph is not None:
+            vcg = self._variable_constraint_graph
+            nodes = vcg.nodes(data=True)
+            edges = vcg.edges(data=True)
+            num_edges = vcg.number_of_edges()
+        else:
+            nodes, edge_data = self._collect_vcg_elements()
+            edges = [(u, v, data) for (u, v), data in edge_data.items()]
+            num_edges = len(edges)
+
+        variable_names = []
+        variable_domain = []
+        constraint_kind = []
+        constraint_bound = []
+        constraint_is_linear = []
+        variable_index = {}
+        constraint_index = {}
+
+        for name, data in nodes:
+            if data["type"] == "variable":
+                variable_index[name] = len(variable_names)
+                variable_names.append(name)
+                variable_domain.append(data["domain"])
+            elif data["type"] == "constraint":
+                constraint_index[name] = len(constraint_kind)
+                constraint_kind.append(data["kind"])
+                constraint_bound.append(data["bound"])
+                constraint_is_linear.append(data["is_linear"])
+
+        edge_constraint = np.empty(num_edges, dtype=np.intp)
+        edge_variable = np.empty(num_edges, dtype=np.intp)
+        edge_is_linear = np.empty(num_edges, dtype=bool)
+        edge_coeff = np.zeros(num_edges, dtype=np.float64)
+        for i, (node1, node2, data) in enumerate(edges):
+            if node1 in variable_index:
+                node1, node2 = node2, node1
+
+            edge_constraint[i] = constraint_index[node1]
+            edge_variable[i] = variable_index[node2]
+            edge_is_linear[i] = data["is_linear"]
+            if data["is_linear"]:
+                edge_coeff[i] = data["coeff"]
+
+        self._vcg_arrays = {
+            "variable_names": variable_names,
+            "variable_domain": np.array(variable_domain, dtype=str),
+            "constraint_kind": np.array(constraint_kind, dtype=str),
+            "constraint_bound": np.array(constraint_bound, dtype=np.float64),
+            "constraint_is_linear": np.array(constraint_is_linear, dtype=bool),
+            "edge_constraint": edge_constraint,
+            "edge_variable": edge_variable,
+            "edge_is_linear": edge_is_linear,
+            "edge_coeff": edge_coeff,
+            "variable_degree": np.bincount(
+                edge_variable, minlength=len(variable_names)
+            ),
+        }
+
+        return self._vcg_arrays
 
     def __build_full_path(
         self, extension: str, path_prefix: Union[str, Path], extra_params: str = ""
@@ -880,13 +1267,16 @@ class Problem(ABC):
 
         filename = Path(filename)
 
-        if not filename.parent.exists():
-            filename.parent.mkdir(parents=True)
+        filename.parent.mkdir(parents=True, exist_ok=True)
 
         return str(filename)
 
     def save(
-        self, path_prefix: Union[Path, str] = None, params=False, features=False
+        self,
+        path_prefix: Union[Path, str] = None,
+        params=False,
+        features=False,
+        symbolic_labels: bool = True,
     ) -> None:
         """
         Save the associated model, problem parameters, and problem features
@@ -900,13 +1290,25 @@ class Problem(ABC):
         :param params: Whether to save model parameters to a pickle file, default False
         :param features: Whether to save computed features to a json file, default False.
                This can be very slow for large models.
+        :param symbolic_labels: Whether to name variables and constraints in the
+               model file after their Pyomo names, default True. Otherwise short
+               generated labels are used, which is faster to write and gives
+               smaller files for large models.
         """
         if self.is_linear:
             model_filename = self.__build_full_path(".mps", path_prefix)
         else:
             model_filename = self.__build_full_path(".gms", path_prefix)
 
-        self.model.write(model_filename, io_options={"symbolic_solver_labels": True})
+        symbol_map_id = self.model.write(
+            model_filename, io_options={"symbolic_solver_labels": symbolic_labels}
+        )[1]
+
+        # Pyomo keeps the symbol map of every write on the model, which references
+        # every component. Nothing reads it back, and it would otherwise grow the
+        # model with each save, and every pickle of it (such as instances returned
+        # from parallel workers).
+        self.model.solutions.delete_symbol_map(symbol_map_id)
 
         if params:
             params_filename = self.__build_full_path(
@@ -916,7 +1318,7 @@ class Problem(ABC):
             parameters = self.get_parameters()
 
             with open(params_filename, "wb+") as fd:
-                pickle.dump(parameters, fd)
+                pickle.dump(parameters, fd, protocol=pickle.HIGHEST_PROTOCOL)
 
         if features:
             features_filename = self.__build_full_path(
@@ -942,8 +1344,8 @@ class Problem(ABC):
 
         filename = self.__build_full_path(".pkl", path_prefix)
 
-        with open(filename, "wb+") as fd:
-            pickle.dump(self, fd)
+        with open(filename, "wb", buffering=_PICKLE_BUFFER_SIZE) as fd:
+            pickle.dump(self, fd, protocol=pickle.HIGHEST_PROTOCOL)
 
     @classmethod
     def load(cls: Type[T], pkl_path: Union[Path, str]) -> T:
@@ -954,7 +1356,7 @@ class Problem(ABC):
         :return: Problem instance
         """
 
-        with open(pkl_path, "rb") as fd:
+        with open(pkl_path, "rb", buffering=_PICKLE_BUFFER_SIZE) as fd:
             obj = pickle.load(fd)
 
         return obj
@@ -987,3 +1389,57 @@ class Problem(ABC):
             params = pickle.load(fd)
 
         return cls(**params)
+
+
+def _save_instance(
+    problem: Problem,
+    path_prefix: Union[Path, str],
+    params: bool,
+    features: bool,
+    symbolic_labels: bool,
+) -> None:
+    problem.save(
+        path_prefix, params=params, features=features, symbolic_labels=symbolic_labels
+    )
+
+
+def save_many(
+    problems: Iterable[Problem],
+    path_prefix: Union[Path, str] = None,
+    params: bool = False,
+    features: bool = False,
+    symbolic_labels: bool = True,
+    max_workers: Optional[int] = None,
+) -> None:
+    """
+    Save many problem instances in parallel, as with :meth:`Problem.save`
+
+    Instances are independent, so each is written by one of a pool of worker
+    processes. They are pickled to be sent to the workers, so must be picklable,
+    as for :meth:`Problem.dump`. Workers are forked where available.
+
+    :param problems: Problem instances to save
+    :param path_prefix: Folder to save to
+    :param params: Whether to save model parameters to a pickle file, default False
+    :param features: Whether to save computed features to a json file, default False
+    :param symbolic_labels: Whether to use Pyomo names as labels in the model files,
+        default True
+    :param max_workers: Number of worker processes, default None for the number of
+        CPUs
+    """
+
+    context = None
+    if "fork" in mp.get_all_start_methods():
+        context = mp.get_context("fork")
+
+    save = partial(
+        _save_instance,
+        path_prefix=path_prefix,
+        params=params,
+        features=features,
+        symbolic_labels=symbolic_labels,
+    )
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        # Consume the results, so errors in workers are raised here
+        for _ in executor.map(save, problems):
+            pass
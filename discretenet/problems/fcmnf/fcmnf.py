@@ -1,14 +1,42 @@
 from pathlib import Path
-import random
-from typing import Union
+from typing import Tuple, Union
 
 import networkx as nx
+import numpy as np
 import pyomo.environ as pyo
 
 from discretenet.problem import Problem
 from discretenet.generator import Generator
 
 
+def _component_reachability(graph: nx.DiGraph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute reachability between the strongly connected components of a graph
+    with nodes labelled ``0..n-1``
+
+    :param graph: directed networkx graph
+    :return: array mapping each node to its component, and a boolean matrix
+        whose ``[a, b]`` entry is whether component ``b`` is reachable from
+        component ``a``. Every component is marked reachable from itself.
+    """
+    condensation = nx.condensation(graph)
+
+    components = np.empty(nx.number_of_nodes(graph), dtype=np.int64)
+    for node, component in condensation.graph["mapping"].items():
+        components[node] = component
+
+    # Visit components in reverse topological order, so that each component's
+    # successors are complete by the time their rows are merged into its own
+    num_components = nx.number_of_nodes(condensation)
+    reachable = np.eye(num_components, dtype=bool)
+    for component in reversed(list(nx.topological_sort(condensation))):
+        successors = list(condensation.successors(component))
+        if successors:
+            reachable[component] |= reachable[successors].any(axis=0)
+
+    return components, reachable
+
+
 class FCMNFProblem(Problem):
     is_linear = True
 
@@ -34,37 +62,46 @@ class FCMNFProblem(Problem):
 
         model = pyo.ConcreteModel()
 
+        # Read the edge attributes in a single pass over the graph
+        edges = []
+        fixed_costs = []
+        var_costs = []
+        caps = []
+        for node1, node2, edge in graph.edges(data=True):
+            edges.append((node1, node2))
+            fixed_costs.append(edge["fixed_cost"])
+            var_costs.append(edge["var_cost"])
+            caps.append(edge["cap"])
+
         # initialize variables and coefficients
-        model.edges = pyo.Set(initialize=list(graph.edges()))
+        model.edges = pyo.Set(initialize=edges)
         model.K = pyo.Set(initialize=range(num_commodities))
 
-        def DK_init(m):
-            return ((node1, node2, k) for node1, node2 in m.edges for k in m.K)
-
-        model.DK = pyo.Set(dimen=3, initialize=DK_init)
-
         model.y = pyo.Var(model.edges, domain=pyo.Binary)
-        model.x = pyo.Var(model.DK, domain=pyo.Binary)
+        model.x = pyo.Var(model.edges, model.K, domain=pyo.Binary)
 
         model.objective = pyo.Objective(
             expr=pyo.quicksum(
-                edge["fixed_cost"] * model.y[node1, node2]
-                for node1, node2, edge in graph.edges(data=True)
+                fixed_cost * model.y[node1, node2]
+                for (node1, node2), fixed_cost in zip(edges, fixed_costs)
             )
             + pyo.quicksum(
-                pyo.quicksum(
-                    edge["var_cost"] * od_list[k][2] * model.x[node1, node2, k]
-                    for node1, node2, edge in graph.edges(data=True)
-                )
+                var_cost * od_list[k][2] * model.x[node1, node2, k]
                 for k in range(num_commodities)
+                for (node1, node2), var_cost in zip(edges, var_costs)
             ),
             sense=pyo.minimize,
         )
 
+        # Adjacency is the same for every commodity, so look it up once
+        nodes = list(graph.nodes())
+        successors = {node: list(graph.successors(node)) for node in nodes}
+        predecessors = {node: list(graph.predecessors(node)) for node in nodes}
+
         model.constraint1 = pyo.ConstraintList()
         # constraint 1
         for k in range(num_commodities):
-            for node in graph.nodes():
+            for node in nodes:
                 rhs = 0.0
                 if od_list[k][0] == node:
                     rhs = 1.0
@@ -72,12 +109,11 @@ class FCMNFProblem(Problem):
                     rhs = -1.0
                 model.constraint1.add(
                     pyo.quicksum(
-                        model.x[node, successor, k]
-                        for successor in graph.successors(node)
+                        model.x[node, successor, k] for successor in successors[node]
                     )
                     - pyo.quicksum(
                         model.x[predecessor, node, k]
-                        for predecessor in graph.predecessors(node)
+                        for predecessor in predecessors[node]
                     )
                     - rhs
                     == 0
@@ -85,13 +121,13 @@ class FCMNFProblem(Problem):
 
         model.constraint2 = pyo.ConstraintList()
         # constraint 2
-        for node1, node2, edge in graph.edges(data=True):
+        for (node1, node2), cap in zip(edges, caps):
             model.constraint2.add(
                 pyo.quicksum(
                     od_list[k][2] * model.x[node1, node2, k]
                     for k in range(num_commodities)
                 )
-                - edge["cap"] * model.y[node1, node2]
+                - cap * model.y[node1, node2]
                 <= 0
             )
 
@@ -159,8 +195,8 @@ class FCMNFGenerator(Generator[FCMNFProblem]):
         self.num_commodities = num_commodities
 
         # Generate random graph
-        num_nodes = random.randint(min_n, max_n)
-        self.base_graph = nx.erdos_renyi_graph(
+        num_nodes = int(self.rng.integers(min_n, max_n, endpoint=True))
+        self.base_graph = nx.fast_gnp_random_graph(
             n=num_nodes, p=er_prob, seed=self.random_seed, directed=True
         )
         self.name = "nc{}_er_n{}_m{}_p{}_vcr{}_{}_cqr{}_{}_fvr{}_eu{}".format(
@@ -177,9 +213,7 @@ class FCMNFGenerator(Generator[FCMNFProblem]):
         )
 
     def generate(self):
-        graph = self.base_graph.copy()
-
-        od_list = self.generate_random_vars(graph)
+        graph, od_list = self.generate_random_vars()
         problem = FCMNFProblem(
             graph,
             self.num_commodities,
@@ -188,37 +222,76 @@ class FCMNFGenerator(Generator[FCMNFProblem]):
         )
         return problem
 
-    def generate_random_vars(self, graph):
+    def generate_random_vars(self) -> Tuple[nx.DiGraph, list]:
+        """
+        Draw random edge attributes and commodities for the base graph
 
-        for u, v, edge in graph.edges(data=True):
-            edge["var_cost"] = random.randint(
-                self.variable_costs_range_lower, self.variable_costs_range_upper
-            )
-            edge["fixed_cost"] = random.randint(
-                self.fixed_costs_range[0], self.fixed_costs_range[1]
-            )
-            edge["cap"] = random.randint(1, self.edge_upper) * random.randint(
-                self.commodities_quantities_range_lower,
-                self.commodities_quantities_range_upper,
+        :return: a new graph with the base graph's topology and random edge
+            attributes, and the list of (origin, destination, quantity) tuples
+        """
+        # Draw each edge attribute for all edges at once
+        num_edges = self.base_graph.number_of_edges()
+        var_costs = self.rng.integers(
+            self.variable_costs_range_lower,
+            self.variable_costs_range_upper,
+            size=num_edges,
+            endpoint=True,
+        )
+        fixed_costs = self.rng.integers(
+            self.fixed_costs_range[0],
+            self.fixed_costs_range[1],
+            size=num_edges,
+            endpoint=True,
+        )
+        caps = self.rng.integers(
+            1, self.edge_upper, size=num_edges, endpoint=True
+        ) * self.rng.integers(
+            self.commodities_quantities_range_lower,
+            self.commodities_quantities_range_upper,
+            size=num_edges,
+            endpoint=True,
+        )
+
+        # Build the instance graph directly with its attributes, rather than
+        # copying the base graph and then assigning to each edge
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.base_graph)
+        graph.add_edges_from(
+            (u, v, {"var_cost": var_cost, "fixed_cost": fixed_cost, "cap": cap})
+            for (u, v), var_cost, fixed_cost, cap in zip(
+                self.base_graph.edges(),
+                var_costs.tolist(),
+                fixed_costs.tolist(),
+                caps.tolist(),
             )
-        # generate o-d pairs + quantity
-        od_list = []
+        )
+
+        # generate o-d pairs + quantity, drawing candidate pairs in batches and
+        # keeping those whose destination is reachable from their origin
         n = nx.number_of_nodes(graph)
-        while len(od_list) < self.num_commodities:
-            i, j = random.randint(0, n - 1), random.randint(0, n - 1)
-            if i != j and nx.has_path(graph, i, j):
-                od_list += [
-                    (
-                        i,
-                        j,
-                        random.randint(
-                            self.commodities_quantities_range_lower,
-                            self.commodities_quantities_range_upper,
-                        ),
-                    )
-                ]
+        components, reachable = _component_reachability(graph)
+        od_pairs = np.empty((0, 2), dtype=np.int64)
+        while len(od_pairs) < self.num_commodities:
+            candidates = self.rng.integers(n, size=(8 * self.num_commodities, 2))
+            origins = components[candidates[:, 0]]
+            destinations = components[candidates[:, 1]]
+            valid = (candidates[:, 0] != candidates[:, 1]) & reachable[
+                origins, destinations
+            ]
+            od_pairs = np.concatenate((od_pairs, candidates[valid]))
+        od_pairs = od_pairs[: self.num_commodities]
+
+        quantities = self.rng.integers(
+            self.commodities_quantities_range_lower,
+            self.commodities_quantities_range_upper,
+            size=self.num_commodities,
+            endpoint=True,
+        )
+        od_list = list(
+            zip(od_pairs[:, 0].tolist(), od_pairs[:, 1].tolist(), quantities.tolist())
+        )
 
-        return od_list
+        return graph, od_list
 
 
 if __name__ == "__main__":
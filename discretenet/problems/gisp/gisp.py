@@ -1,8 +1,11 @@
+from functools import lru_cache
+from itertools import compress
 from pathlib import Path
-import random
-from typing import Union, Optional
+from typing import Optional, Tuple, Union
 
+import numpy as np
 import pyomo.environ as pyo
+from pyomo.core.expr.numeric_expr import LinearExpression
 import networkx as nx
 
 try:
@@ -14,6 +17,22 @@ from discretenet.problem import Problem
 from discretenet.generator import Generator
 
 
+@lru_cache(maxsize=None)
+def _read_dimacs_edges(graph_instance: str) -> Tuple[Tuple[int, int], ...]:
+    """
+    Read the edges of a packaged DIMACS graph, caching the result so that each
+    file is only parsed once per process
+
+    :param graph_instance: name of the .clq file in ``discretenet.problems.gisp.graphs``
+    :return: tuple of (node1, node2) edges, in file order
+    """
+    with open_text("discretenet.problems.gisp.graphs", graph_instance) as f:
+        return tuple(
+            (int(arr[1]), int(arr[2]))
+            for arr in (line.split() for line in f if line.startswith("e"))
+        )
+
+
 class GISPProblem(Problem):
     is_linear = True
 
@@ -37,37 +56,33 @@ class GISPProblem(Problem):
     def create_model(self):
         model = pyo.ConcreteModel()
         #  initialize variables and cost functions
-        coeffs = {}
         model.nodes = pyo.Set(initialize=list(self.graph.nodes()))
         model.x = pyo.Var(model.nodes, domain=pyo.Binary)
-        for node in self.graph.nodes():
-            coeffs[node] = self.graph.nodes[node]["revenue"]
 
         model.E2 = pyo.Set(initialize=self.E2)
         model.y = pyo.Var(model.E2, domain=pyo.Binary)
-        for node1, node2 in self.E2:
-            coeffs[node1, node2] = -1 * self.graph[node1][node2]["cost"]
 
-        #  objective function
+        #  objective function, built directly in Pyomo's flat linear form
+        #  rather than as a sum of terms
+        revenues = [revenue for _, revenue in self.graph.nodes(data="revenue")]
+        costs = [-self.graph[node1][node2]["cost"] for node1, node2 in self.E2]
         model.objective = pyo.Objective(
-            expr=pyo.quicksum(
-                coeffs[node] * model.x[node] for node in self.graph.nodes()
-            )
-            + pyo.quicksum(
-                coeffs[node1, node2] * model.y[node1, node2] for node1, node2 in self.E2
+            expr=LinearExpression(
+                constant=0,
+                linear_coefs=revenues + costs,
+                linear_vars=list(model.x.values()) + list(model.y.values()),
             ),
             sense=pyo.maximize,
         )
 
-        #  add constraints
+        removable = set(self.E2)
         model.constraints = pyo.ConstraintList()
-        for node1, node2, edge in self.graph.edges(data=True):
-            if (node1, node2) not in self.E2:
-                model.constraints.add(model.x[node1] + model.x[node2] <= 1)
+        x, y, add = model.x, model.y, model.constraints.add
+        for node1, node2 in self.graph.edges():
+            if (node1, node2) not in removable:
+                add(x[node1] + x[node2] <= 1)
             else:
-                model.constraints.add(
-                    model.x[node1] + model.x[node2] - model.y[node1, node2] <= 1
-                )
+                add(x[node1] + x[node2] - y[node1, node2] <= 1)
 
         self.model = model
 
@@ -128,8 +143,8 @@ class GISPGenerator(Generator[GISPProblem]):
 
         if self.graph_instance is None:
             # Generate random graph
-            num_nodes = random.randint(self.min_n, self.max_n)
-            self.base_graph = nx.erdos_renyi_graph(
+            num_nodes = int(self.rng.integers(self.min_n, self.max_n, endpoint=True))
+            self.base_graph = nx.fast_gnp_random_graph(
                 n=num_nodes, p=self.er_prob, seed=self.random_seed
             )
             self.name = "er_n=%d_m=%d_p=%.2f_%s_setparam=%.2f_alpha=%.2f" % (
@@ -151,19 +166,12 @@ class GISPGenerator(Generator[GISPProblem]):
 
     def dimacs_to_nx(self):
         g = nx.Graph()
-        with open_text("discretenet.problems.gisp.graphs", self.graph_instance) as f:
-            for line in f:
-                arr = line.split()
-                if line[0] == "e":
-                    g.add_edge(int(arr[1]), int(arr[2]))
+        g.add_edges_from(_read_dimacs_edges(self.graph_instance))
         self.base_graph = g
 
     def generate(self):
-        # create a copy of the graph to randomize
-        graph = self.base_graph.copy()
-
-        # Generate node revenues and edge costs
-        graph = self.generate_revs_costs(graph)
+        # Generate a copy of the graph with node revenues and edge costs
+        graph = self.generate_revs_costs(self.base_graph)
 
         # Generate the set of removable edges
         E2 = self.generate_E2(graph)
@@ -174,26 +182,49 @@ class GISPGenerator(Generator[GISPProblem]):
         return problem
 
     def generate_revs_costs(self, graph):
+        """
+        Generate node revenues and edge costs for a graph
+
+        :param graph: the graph to randomize, which is left unchanged
+        :return: a new graph with the same nodes and edges, with a revenue
+            attribute on each node and a cost attribute on each edge
+        """
+        nodes = list(graph.nodes())
+        edges = list(graph.edges())
         if self.which_set == "SET1":
-            for node in graph.nodes():
-                graph.nodes[node]["revenue"] = random.randint(1, 100)
-            for u, v, edge in graph.edges(data=True):
-                edge["cost"] = (
-                    graph.nodes[u]["revenue"] + graph.nodes[v]["revenue"]
-                ) / float(self.set_param)
+            # Revenues are kept in an array indexed by node position, so that
+            # edge costs are computed from it in a single expression
+            revenues = self.rng.integers(1, 100, size=len(nodes), endpoint=True)
+
+            position = {node: i for i, node in enumerate(nodes)}
+            endpoints = np.array(
+                [(position[u], position[v]) for u, v in edges], dtype=np.intp
+            ).reshape(-1, 2)
+            costs = (revenues[endpoints].sum(axis=1) / float(self.set_param)).tolist()
+            revenues = revenues.tolist()
         elif self.which_set == "SET2":
-            for node in graph.nodes():
-                graph.nodes[node]["revenue"] = float(self.set_param)
-            for u, v, edge in graph.edges(data=True):
-                edge["cost"] = 1.0
-        return graph
+            revenues = [float(self.set_param)] * len(nodes)
+            costs = [1.0] * len(edges)
+        else:
+            raise ValueError(
+                f"Unrecognized which_set {self.which_set!r}, expected 'SET1' or 'SET2'"
+            )
+
+        # Build the new graph with its attributes directly, rather than copying
+        # the graph and then assigning to each node and edge
+        randomized = nx.Graph()
+        randomized.add_nodes_from(
+            (node, {"revenue": revenue}) for node, revenue in zip(nodes, revenues)
+        )
+        randomized.add_edges_from(
+            (u, v, {"cost": cost}) for (u, v), cost in zip(edges, costs)
+        )
+        return randomized
 
     def generate_E2(self, graph):
-        E2 = []
-        for edge in graph.edges():
-            if random.random() <= self.alpha:
-                E2.append(edge)
-        return E2
+        # One draw per edge, in edge order, as a single vectorized call
+        removable = self.rng.random(graph.number_of_edges()) <= self.alpha
+        return list(compress(graph.edges(), removable.tolist()))
 
 
 if __name__ == "__main__":
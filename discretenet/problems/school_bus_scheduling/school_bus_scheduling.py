@@ -3,11 +3,22 @@ from typing import Union
 
 import numpy as np
 import pyomo.environ as pyo
+from pyomo.core.expr.numeric_expr import LinearExpression
 
 from discretenet.problem import Problem
 from discretenet.generator import Generator
 
 
+def _sum_of(variables: list) -> LinearExpression:
+    """
+    Sum a list of variables as a single linear expression, without building up
+    the sum one term at a time as ``pyo.quicksum`` does
+    """
+    return LinearExpression(
+        constant=0, linear_coefs=[1] * len(variables), linear_vars=variables
+    )
+
+
 class SchoolBusSchedulingProblem(Problem):
     is_linear = True
 
@@ -37,14 +48,17 @@ class SchoolBusSchedulingProblem(Problem):
         model = pyo.ConcreteModel()
         model.T = pyo.Set(initialize=all_time)
         model.S = pyo.Set(initialize=schools)
-        model.R = pyo.Set(initialize=routes)
 
-        def Rs_init(m):
-            return (
-                (s, i) for s in m.S for i, route in enumerate(m.R[s])
-            )  # i is the index of a route not the route values
+        # Route lengths of each school, looked up directly rather than by the
+        # school's position in a Set of routes, which would merge schools with
+        # identical routes
+        route_lengths = dict(zip(schools, routes))
 
-        model.Rs = pyo.Set(dimen=2, initialize=Rs_init)
+        # i is the index of a route not the route values
+        model.Rs = pyo.Set(
+            dimen=2,
+            initialize=[(s, i) for s in schools for i in range(len(route_lengths[s]))],
+        )
 
         model.x = pyo.Var(model.T, model.Rs, domain=pyo.Binary)
         model.y = pyo.Var(model.T, model.S, domain=pyo.Binary)
@@ -52,43 +66,40 @@ class SchoolBusSchedulingProblem(Problem):
 
         model.objective = pyo.Objective(expr=model.z, sense=pyo.minimize)
 
+        # Variables of each route and school in time order. Time slots are
+        # 1, 2, ..., so the sums over ranges of time slots below are slices
+        # of these lists, rather than one index lookup per term.
+        route_x = {(s, r): [model.x[t, s, r] for t in all_time] for s, r in model.Rs}
+        school_y = {s: [model.y[t, s] for t in all_time] for s in schools}
+
         def c1_rule(m, s, r):
-            return pyo.quicksum(m.x[t, s, r] for t in m.T) == 1
+            return _sum_of(route_x[s, r]) == 1
 
         model.c1 = pyo.Constraint(model.Rs, rule=c1_rule)
 
         def c2_rule(m, s):
-            return pyo.quicksum(m.y[t, s] for t in m.T) == 1
+            return _sum_of(school_y[s]) == 1
 
         model.c2 = pyo.Constraint(model.S, rule=c2_rule)
 
         def c3_rule(m, t, s, r):
-            return pyo.quicksum(
-                m.x[t_prime, s, r] for t_prime in range(1, t + 1)
-            ) <= pyo.quicksum(
-                m.y[t_prime, s] for t_prime in range(1, min(t + time_window + 1, 120))
+            return _sum_of(route_x[s, r][:t]) <= _sum_of(
+                school_y[s][: min(t + time_window, 119)]
             )
 
         model.c3 = pyo.Constraint(model.T, model.Rs, rule=c3_rule)
 
         def c4_rule(m, t, s, r):
-            return pyo.quicksum(
-                m.y[t_prime, s] for t_prime in range(1, t + 1)
-            ) <= pyo.quicksum(m.x[t_prime, s, r] for t_prime in range(1, t + 1))
+            return _sum_of(school_y[s][:t]) <= _sum_of(route_x[s, r][:t])
 
         model.c4 = pyo.Constraint(model.T, model.Rs, rule=c4_rule)
 
         def c5_rule(m, t):
-            return (
-                pyo.quicksum(
-                    pyo.quicksum(
-                        m.x[t_prime, s, r]
-                        for t_prime in range(t, min(t + m.R[s][r], all_time[-1] + 1))
-                    )
-                    for s, r in m.Rs
-                )
-                <= model.z
-            )
+            running = []
+            for s, r in m.Rs:
+                end = min(t + route_lengths[s][r] - 1, all_time[-1])
+                running.extend(route_x[s, r][t - 1 : max(end, t - 1)])
+            return _sum_of(running) <= model.z
 
         model.c5 = pyo.Constraint(model.T, rule=c5_rule)
         self.model = model
@@ -170,16 +181,14 @@ class SchoolBusSchedulingGenerator(Generator[SchoolBusSchedulingProblem]):
         return list(range(1, self.num_schools + 1))
 
     def generate_routes(self, schools):
-        routes = []
-        for _ in schools:
-            routes.append(
-                list(
-                    np.random.normal(
-                        self.route_length_avg, self.route_length_std, self.num_routes
-                    ).astype(int)
-                )
-            )
-        return routes
+        # Draw every school's route lengths at once, one row per school. Routes
+        # take at least one time slot.
+        route_lengths = self.rng.normal(
+            self.route_length_avg,
+            self.route_length_std,
+            (len(schools), self.num_routes),
+        ).astype(int)
+        return np.maximum(route_lengths, 1).tolist()
 
 
 if __name__ == "__main__":
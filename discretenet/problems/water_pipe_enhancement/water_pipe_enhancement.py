@@ -2,9 +2,9 @@ from pathlib import Path
 from typing import Union
 
 import networkx as nx
-import numpy as np
 import pickle
 import pyomo.environ as pyo
+from pyomo.core.expr.numeric_expr import LinearExpression
 
 try:
     from importlib.resources import open_binary
@@ -42,18 +42,30 @@ class WaterPipeEnhancementProblem(Problem):
         self.C = C
         self.T = T
         self.name = name
-        self.undirected_graph = graph.to_undirected()
 
         self.create_model()
 
+    @property
+    def undirected_graph(self) -> nx.MultiGraph:
+        """
+        Read-only undirected view of ``self.graph``, built on access rather than
+        copied when the problem is constructed
+        """
+
+        return self.graph.to_undirected(as_view=True)
+
     def create_model(self):
         num_nodes = nx.number_of_nodes(self.graph)
         num_edges = nx.number_of_edges(self.graph)
 
+        # Walk the graph's edges once, and reuse them for every component below
+        edges_with_data = list(self.graph.edges(data=True))
+        edges = [(node1, node2) for node1, node2, _ in edges_with_data]
+
         model = pyo.ConcreteModel()
 
         #  initialize variables
-        model.edges = pyo.Set(initialize=list(self.graph.edges()))
+        model.edges = pyo.Set(initialize=edges)
         model.x = pyo.Var(model.edges, domain=pyo.Binary)
         model.y = pyo.Var(model.edges, domain=pyo.Integers)
 
@@ -61,78 +73,118 @@ class WaterPipeEnhancementProblem(Problem):
         model.yT = pyo.Var(model.T, domain=pyo.Integers)
         model.z = pyo.Var(domain=pyo.Integers)
 
+        # Plain dicts of the variables, which are cheaper to look up than the
+        # indexed components when building the constraints below
+        x = dict(model.x.items())
+        y = dict(model.y.items())
+        yT = dict(model.yT.items())
+
         # objective function
         model.objective = pyo.Objective(
-            expr=pyo.quicksum(
-                edge["length"] * model.x[node1, node2]
-                for node1, node2, edge in self.graph.edges(data=True)
+            expr=LinearExpression(
+                constant=0,
+                linear_coefs=[edge["length"] for _, _, edge in edges_with_data],
+                linear_vars=[x[edge] for edge in edges],
             ),
             sense=pyo.minimize,
         )
 
         model.constraints = pyo.ConstraintList()
         # constraint 1:
+        # Gather the flow variables entering and leaving each node in one pass
+        # over the edges, each with its coefficient in the node's flow balance
+        inflow = {node: [] for node in self.graph.nodes()}
+        outflow = {node: [] for node in self.graph.nodes()}
+        for node1, node2 in edges:
+            inflow[node2].append(y[node1, node2])
+            outflow[node1] += [x[node1, node2], y[node1, node2]]
+
+        sources = set(self.T)
+        critical = set(self.C)
         for node in self.graph.nodes():
+            flow_vars = inflow[node] + outflow[node]
+            flow_coefs = [1] * len(inflow[node]) + [-1] * len(outflow[node])
+            if node in sources:
+                flow_vars.append(yT[node])
+                flow_coefs.append(1)
             model.constraints.add(
-                (model.yT[node] if node in self.T else 0)
-                + pyo.quicksum(
-                    model.y[node1, node2] for node1, node2 in self.graph.in_edges(node)
-                )
-                - pyo.quicksum(
-                    model.x[node1, node2] + model.y[node1, node2]
-                    for node1, node2 in self.graph.out_edges(node)
+                LinearExpression(
+                    constant=0, linear_coefs=flow_coefs, linear_vars=flow_vars
                 )
-                == (1 if node in self.C else 0)
+                == (1 if node in critical else 0)
             )
 
         # constraints 2
+        # Each pair of nodes joined by a pipe in either direction is visited once
+        # from its first node. Neighbours are listed in the order the pipes are
+        # met, as in the adjacency of ``self.graph.to_undirected()``, which is not
+        # built here since it deep-copies every edge's data.
+        neighbours = {node: {} for node in self.graph.nodes()}
+        for node1, node2 in edges:
+            neighbours[node1][node2] = None
+            neighbours[node2][node1] = None
+
         visited = set()
-        for node1, node2 in self.undirected_graph.edges():
-            if (node1, node2) not in visited and (node2, node1) not in visited:
-                model.constraints.add(
-                    model.x[node1, node2] + model.x[node2, node1] <= 1
-                )
-                visited.add((node1, node2))
-                visited.add((node2, node1))
+        for node1, adjacent in neighbours.items():
+            for node2 in adjacent:
+                if node2 not in visited:
+                    model.constraints.add(x[node1, node2] + x[node2, node1] <= 1)
+            visited.add(node1)
 
         # constraint 3:
         for Sr in self.SR:
+            # Keep one orientation of each pipe. Adding an edge twice is a no-op,
+            # so only its reverse needs to be checked.
             cleaned_Sr = set()
             for node1, node2 in Sr:
-                if (node1, node2) not in cleaned_Sr and (
-                    node2,
-                    node1,
-                ) not in cleaned_Sr:
+                if (node2, node1) not in cleaned_Sr:
                     cleaned_Sr.add((node1, node2))
+
+            area_vars = []
+            for node1, node2 in cleaned_Sr:
+                area_vars += [x[node1, node2], x[node2, node1]]
             model.constraints.add(
-                pyo.quicksum(
-                    model.x[node1, node2] + model.x[node2, node1]
-                    for node1, node2 in cleaned_Sr
+                LinearExpression(
+                    constant=0, linear_coefs=[1] * len(area_vars), linear_vars=area_vars
                 )
                 >= 1
             )
 
-        # constraint 4:
-        for node1, node2 in self.graph.edges():
-            model.constraints.add(model.y[node1, node2] >= 0)
-            model.constraints.add(
-                model.y[node1, node2] - (num_edges + num_nodes) * model.x[node1, node2]
-                <= 0
-            )
-
         # constraint 5
+        source_vars = [yT[t] for t in self.T]
         model.constraints.add(
-            model.z + pyo.quicksum(model.yT[t] for t in self.T)
+            LinearExpression(
+                constant=0,
+                linear_coefs=[1] * (len(source_vars) + 1),
+                linear_vars=[model.z] + source_vars,
+            )
             == (num_edges + num_nodes)
         )
 
         # constraint 6
         model.constraints.add(
-            pyo.quicksum(model.yT[t] for t in self.T)
-            - pyo.quicksum(model.x[node1, node2] for node1, node2 in self.graph.edges())
+            LinearExpression(
+                constant=0,
+                linear_coefs=[1] * len(source_vars) + [-1] * num_edges,
+                linear_vars=source_vars + [x[edge] for edge in edges],
+            )
             == len(self.C)
         )
 
+        # constraint 4, declared as indexed constraints over the edges rather
+        # than added to the list one row at a time
+        big_m = num_edges + num_nodes
+
+        def constraint4a_rule(m, node1, node2):
+            return m.y[node1, node2] >= 0
+
+        model.constraint4a = pyo.Constraint(model.edges, rule=constraint4a_rule)
+
+        def constraint4b_rule(m, node1, node2):
+            return m.y[node1, node2] - big_m * m.x[node1, node2] <= 0
+
+        model.constraint4b = pyo.Constraint(model.edges, rule=constraint4b_rule)
+
         self.model = model
 
     def get_name(self) -> str:
@@ -222,7 +274,7 @@ class WaterPipeEnhancementGenerator(Generator[WaterPipeEnhancementProblem]):
         C_size = max(1, int(num_nodes * self.critical_rate))
         T_size = max(1, int(num_nodes * self.water_source_rate))
         R_size = max(1, int(num_nodes * self.housing_area_rate))
-        selected_nodes = np.random.choice(
+        selected_nodes = self.rng.choice(
             list(graph.nodes()), size=C_size + T_size + R_size
         )
         C = selected_nodes[:C_size]
@@ -243,11 +295,11 @@ class WaterPipeEnhancementGenerator(Generator[WaterPipeEnhancementProblem]):
                 next_level = set()
                 for node in this_level:
                     for neighbour in graph[node]:
-                        graph.edges[node, neighbour, 0]["role"] = "SR"
                         edge = (node, neighbour)
                         if edge not in Sr:
                             Sr.add(edge)
                             next_level.add(neighbour)
+                            graph.edges[node, neighbour, 0]["role"] = "SR"
                 this_level = next_level
                 i -= 1
             SR.append(Sr)
@@ -3,6 +3,7 @@ from typing import Union
 
 import pyomo.environ as pyo
 import numpy as np
+import pytest
 
 from discretenet.generator import Generator
 from discretenet.problem import Problem
@@ -43,8 +44,19 @@ class FakeGenerator(Generator[FakeProblem]):
         self.n = n
 
     def generate(self):
-        obj_coeffs = np.random.randint(10, size=self.n)
-        constr_coeffs = np.random.randint(10, size=self.n)
+        obj_coeffs = self.rng.integers(10, size=self.n)
+        constr_coeffs = self.rng.integers(10, size=self.n)
+        return FakeProblem(obj_coeffs, constr_coeffs)
+
+
+class PreSamplingFakeGenerator(FakeGenerator):
+    def pre_sample(self, n_instances):
+        return {"obj_coeffs": self.rng.integers(10, size=(n_instances, self.n))}
+
+    def generate(self, obj_coeffs=None):
+        if obj_coeffs is None:
+            obj_coeffs = self.rng.integers(10, size=self.n)
+        constr_coeffs = self.rng.integers(10, size=self.n)
         return FakeProblem(obj_coeffs, constr_coeffs)
 
 
@@ -82,10 +94,11 @@ def test_generator_calls_are_different():
     instances2 = generate_fake_problem(n_instances=10, n_jobs=1, save=False)
 
     assert any(
-        np.any(i1.obj_coeffs != i2.obj_coeffs) for i1, i2 in zip(instances1, instances2)
+        not np.array_equal(i1.obj_coeffs, i2.obj_coeffs)
+        for i1, i2 in zip(instances1, instances2)
     )
     assert any(
-        np.any(i1.constr_coeffs != i2.obj_coeffs)
+        not np.array_equal(i1.constr_coeffs, i2.obj_coeffs)
         for i1, i2 in zip(instances1, instances2)
     )
 
@@ -106,10 +119,11 @@ def test_generator_reproducible_single_process():
     instances2 = generate_fake_problem(n_instances=10, n_jobs=1, save=False)
 
     assert all(
-        np.all(i1.obj_coeffs == i2.obj_coeffs) for i1, i2 in zip(instances1, instances2)
+        np.array_equal(i1.obj_coeffs, i2.obj_coeffs)
+        for i1, i2 in zip(instances1, instances2)
     )
     assert all(
-        np.all(i1.constr_coeffs == i2.constr_coeffs)
+        np.array_equal(i1.constr_coeffs, i2.constr_coeffs)
         for i1, i2 in zip(instances1, instances2)
     )
 
@@ -129,8 +143,8 @@ def test_generator_reproducible_multiple_processes():
     instances = generate_fake_problem(n_instances=8, n_jobs=2, save=False)
 
     # If the seeds weren't pre-set, some of these would be duplicated
-    obj_coeffs = [tuple(i.obj_coeffs.tolist()) for i in instances]
-    assert len(instances) == len(set(obj_coeffs))
+    obj_coeffs = {i.obj_coeffs.tobytes() for i in instances}
+    assert len(instances) == len(obj_coeffs)
 
 
 def test_generator_calls_save_if_told_to(tmp_path):
@@ -141,3 +155,186 @@ def test_generator_calls_save_if_told_to(tmp_path):
     instances[0].model.write.assert_called_with(
         str(tmp_path / "mock_problem.mps"), io_options={"symbolic_solver_labels": True}
     )
+
+
+def test_generator_saves_in_threads(tmp_path):
+    generate_mock_problem = MockGenerator(path_prefix=tmp_path)
+    instances = generate_mock_problem(
+        n_instances=3, n_jobs=1, save=True, save_params=False, save_threads=2
+    )
+
+    assert len(instances) == 3
+    for instance in instances:
+        instance.model.write.assert_called_once_with(
+            str(tmp_path / "mock_problem.mps"),
+            io_options={"symbolic_solver_labels": True},
+        )
+
+
+def test_generator_streams_instances():
+    """
+    Streaming instances should yield the same instances as returning a list,
+    although possibly in a different order
+    """
+
+    generate_fake_problem = FakeGenerator(n=5, random_seed=42)
+
+    instances1 = generate_fake_problem(n_instances=8, n_jobs=2, save=False)
+    generate_fake_problem.set_seed(42)
+    instances2 = generate_fake_problem(
+        n_instances=8, n_jobs=2, save=False, return_as="generator"
+    )
+
+    assert not isinstance(instances2, list)
+
+    obj_coeffs1 = sorted(i.obj_coeffs.tobytes() for i in instances1)
+    obj_coeffs2 = sorted(i.obj_coeffs.tobytes() for i in instances2)
+    assert obj_coeffs1 == obj_coeffs2
+
+
+def test_generator_threading_backend_matches_processes():
+    """
+    Threads share the generator, but each instance should still be generated
+    from its own random seed
+    """
+
+    generate_fake_problem = FakeGenerator(n=5, random_seed=42)
+
+    instances1 = generate_fake_problem(n_instances=8, n_jobs=2, save=False)
+    generate_fake_problem.set_seed(42)
+    instances2 = generate_fake_problem(
+        n_instances=8, n_jobs=2, save=False, backend="threading"
+    )
+
+    assert all(
+        np.array_equal(i1.obj_coeffs, i2.obj_coeffs)
+        for i1, i2 in zip(instances1, instances2)
+    )
+
+
+def test_generator_pre_sampled_parameters():
+    """
+    Parameters pre-sampled for a batch should be passed to each instance in order,
+    whether or not joblib is used
+    """
+
+    generate_fake_problem = PreSamplingFakeGenerator(n=5, random_seed=42)
+    expected = generate_fake_problem.pre_sample(4)
+
+    generate_fake_problem.set_seed(42)
+    instances1 = generate_fake_problem(n_instances=4, n_jobs=1, save=False)
+    generate_fake_problem.set_seed(42)
+    instances2 = generate_fake_problem(n_instances=4, n_jobs=2, save=False)
+
+    for i, (i1, i2) in enumerate(zip(instances1, instances2)):
+        assert np.array_equal(i1.obj_coeffs, expected["obj_coeffs"][i])
+        assert np.array_equal(i2.obj_coeffs, expected["obj_coeffs"][i])
+        assert np.array_equal(i1.constr_coeffs, i2.constr_coeffs)
+
+
+def test_generator_batched_dispatch_matches_per_instance():
+    generate_fake_problem = FakeGenerator(n=5, random_seed=42)
+
+    instances1 = generate_fake_problem(n_instances=7, n_jobs=2, save=False)
+    generate_fake_problem.set_seed(42)
+    instances2 = generate_fake_problem(
+        n_instances=7, n_jobs=2, save=False, batch_size=3
+    )
+
+    assert len(instances2) == 7
+    assert all(
+        np.array_equal(i1.obj_coeffs, i2.obj_coeffs)
+        for i1, i2 in zip(instances1, instances2)
+    )
+
+
+def test_generator_futures_backend_matches_joblib():
+    generate_fake_problem = FakeGenerator(n=5, random_seed=42)
+
+    instances1 = generate_fake_problem(n_instances=8, n_jobs=2, save=False)
+    generate_fake_problem.set_seed(42)
+    instances2 = generate_fake_problem(
+        n_instances=8, n_jobs=2, save=False, backend="futures"
+    )
+
+    assert len(instances2) == 8
+    assert all(
+        np.array_equal(i1.obj_coeffs, i2.obj_coeffs)
+        for i1, i2 in zip(instances1, instances2)
+    )
+
+
+def test_generator_bit_generator_is_configurable():
+    class SFC64FakeGenerator(FakeGenerator):
+        bit_generator = np.random.SFC64
+
+    generate_fake_problem = SFC64FakeGenerator(n=5, random_seed=42)
+    assert isinstance(generate_fake_problem.rng.bit_generator, np.random.SFC64)
+
+    instances1 = generate_fake_problem(n_instances=4, n_jobs=1, save=False)
+    generate_fake_problem.set_seed(42)
+    instances2 = generate_fake_problem(n_instances=4, n_jobs=1, save=False)
+
+    assert all(
+        np.array_equal(i1.obj_coeffs, i2.obj_coeffs)
+        for i1, i2 in zip(instances1, instances2)
+    )
+
+
+def test_generator_warns_on_oversubscription(monkeypatch):
+    # Streamed instances are never consumed, so no worker processes are started
+    monkeypatch.setattr("discretenet.generator.cpu_count", lambda: 1)
+    generate_fake_problem = FakeGenerator(n=5, random_seed=42)
+
+    with pytest.warns(RuntimeWarning):
+        generate_fake_problem(
+            n_instances=1, n_jobs=2, save=False, return_as="generator"
+        )
+
+    with pytest.warns(RuntimeWarning):
+        with generate_fake_problem.parallel(n_jobs=2):
+            generate_fake_problem(n_instances=1, save=False, return_as="generator")
+
+
+def test_generator_accepts_n_jobs_none():
+    generate_fake_problem = FakeGenerator(n=5, random_seed=42)
+    instances = generate_fake_problem(n_instances=2, n_jobs=None, save=False)
+
+    assert len(instances) == 2
+
+
+def test_deterministic_generator_is_not_reseeded():
+    class DeterministicGenerator(MockGenerator):
+        deterministic = True
+
+        def generate(self):
+            problem = MockProblem()
+            problem.seed = self.random_seed
+            problem.state = self.rng.bit_generator.state
+            return problem
+
+    generate_mock_problem = DeterministicGenerator(random_seed=42)
+    state = generate_mock_problem.rng.bit_generator.state
+    instances = generate_mock_problem(n_instances=3, n_jobs=1, save=False)
+
+    # Instances take distinct seeds, for distinct names, but the RNG is untouched
+    assert len({i.seed for i in instances}) == 3
+    assert all(i.state == state for i in instances)
+
+
+def test_generator_reuses_persistent_pool():
+    generate_fake_problem = FakeGenerator(n=5, random_seed=42)
+    instances1 = generate_fake_problem(n_instances=4, n_jobs=2, save=False)
+    instances2 = generate_fake_problem(n_instances=4, n_jobs=2, save=False)
+
+    generate_fake_problem.set_seed(42)
+    with generate_fake_problem.parallel(n_jobs=2):
+        pooled1 = generate_fake_problem(n_instances=4, save=False)
+        pooled2 = generate_fake_problem(n_instances=4, save=False)
+
+    assert generate_fake_problem._parallel is None
+    for expected, actual in ((instances1, pooled1), (instances2, pooled2)):
+        assert all(
+            np.array_equal(i1.obj_coeffs, i2.obj_coeffs)
+            for i1, i2 in zip(expected, actual)
+        )
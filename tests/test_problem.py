@@ -1,12 +1,15 @@
+from collections import defaultdict
 from unittest.mock import MagicMock
+import pickle
 import pytest
 from typing import Union
 
 import networkx as nx
 import numpy as np
 import pyomo.environ as pyo
+from pyomo.core.expr.numeric_expr import LinearExpression
 
-from discretenet.problem import Problem
+from discretenet.problem import Problem, save_many
 
 
 class MockProblem(Problem):
@@ -117,17 +120,19 @@ class ProblemWithParameters(Problem):
 
         self.model = pyo.ConcreteModel()
 
-        self.model.x = pyo.Var(list(range(self.n)), domain=pyo.Reals)
+        self.model.N = pyo.RangeSet(0, self.n - 1)
+        self.model.x = pyo.Var(self.model.N, domain=pyo.Reals)
+        x = list(self.model.x.values())
         self.model.constr1 = pyo.Constraint(
-            expr=pyo.quicksum(
-                self.model.x[i] * self.constr_coeffs[i] for i in range(self.n)
+            expr=LinearExpression(
+                constant=0, linear_coefs=self.constr_coeffs.tolist(), linear_vars=x
             )
             <= 10
         )
 
         self.model.objective = pyo.Objective(
-            expr=pyo.quicksum(
-                self.model.x[i] * self.obj_coeffs[i] for i in range(self.n)
+            expr=LinearExpression(
+                constant=0, linear_coefs=self.obj_coeffs.tolist(), linear_vars=x
             ),
             sense=pyo.minimize,
         )
@@ -142,18 +147,26 @@ class ProblemWithParameters(Problem):
         }
 
     def __eq__(self, other: "ProblemWithParameters"):
-        return np.all(self.constr_coeffs == other.constr_coeffs) and np.all(
-            self.obj_coeffs == other.obj_coeffs
-        )
+        return np.array_equal(
+            self.constr_coeffs, other.constr_coeffs
+        ) and np.array_equal(self.obj_coeffs, other.obj_coeffs)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def vcg() -> nx.Graph:
     problem = LinearProblem()
     return problem.get_variable_constraint_graph()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def vcg_nodes_by_type(vcg) -> dict:
+    nodes_by_type = defaultdict(dict)
+    for node_name, node_data in vcg.nodes(data=True):
+        nodes_by_type[node_data["type"]][node_name] = node_data
+    return nodes_by_type
+
+
+@pytest.fixture(scope="module")
 def nonlinear_vcg() -> nx.Graph:
     problem = NonlinearProblem()
     return problem.get_variable_constraint_graph()
@@ -164,14 +177,9 @@ class TestLinearVCG:
     Test variable constraint graph creation
     """
 
-    def test_variable_nodes_labeled(self, vcg):
+    def test_variable_nodes_labeled(self, vcg_nodes_by_type):
         expected_var_nodes = ["x[1]", "x[2]", "y", "z"]
-        actual_var_nodes = [
-            node_name
-            for node_name, node_data in vcg.nodes(data=True)
-            if node_data["type"] == "variable"
-        ]
-        assert sorted(actual_var_nodes) == expected_var_nodes
+        assert sorted(vcg_nodes_by_type["variable"]) == expected_var_nodes
 
     def test_variable_node_domains(self, vcg):
         # Domain types
@@ -187,13 +195,9 @@ class TestLinearVCG:
         assert vcg.nodes["y"]["obj_coeff"] == 3
         assert vcg.nodes["z"]["obj_coeff"] == 4
 
-    def test_constraint_nodes_labelled(self, vcg):
+    def test_constraint_nodes_labelled(self, vcg_nodes_by_type):
         expected_constr_nodes = ["constr1", "constrs[1]", "constrs[2]"]
-        actual_constr_nodes = [
-            node_name
-            for node_name, node_data in vcg.nodes(data=True)
-            if node_data["type"] == "constraint"
-        ]
+        actual_constr_nodes = list(vcg_nodes_by_type["constraint"])
         assert sorted(expected_constr_nodes) == actual_constr_nodes
 
     def test_constraint_node_kinds(self, vcg):
@@ -217,9 +221,13 @@ class TestLinearVCG:
 
         assert len(vcg.edges) == 7
 
+        edge_coeffs = {}
+        for node1, node2, coeff in vcg.edges(data="coeff"):
+            edge_coeffs[node1, node2] = edge_coeffs[node2, node1] = coeff
+
         for constraint, variables in expected_edges.items():
             for variable, coeff in variables:
-                assert vcg[constraint][variable]["coeff"] == coeff
+                assert edge_coeffs[constraint, variable] == coeff
 
 
 class TestNonlinearVCG:
@@ -250,7 +258,56 @@ class TestNonlinearVCG:
         assert "obj_coeff" not in nonlinear_vcg.nodes["x[2]"]
 
 
+class TestFeatureGroups:
+    def test_groups_are_subsets_of_all_features(self):
+        features = LinearProblem().get_features()
+
+        problem = LinearProblem()
+        counts = problem.get_features(groups=["counts"])
+        assert counts["num_variables"] == features["num_variables"]
+        assert "leq_constraint_bounds_mean" not in counts
+        assert list(problem._feature_groups) == ["counts"]
+
+        assert problem.get_features() == features
+
+    def test_single_group_name(self):
+        problem = LinearProblem()
+        assert problem.get_features(groups="counts") == problem.get_features(
+            groups=["counts"]
+        )
+
+    def test_unknown_group(self):
+        with pytest.raises(ValueError):
+            LinearProblem().get_features(groups=["not_a_group"])
+
+
 class TestSavingLoading:
+    def test_pickle_drops_caches(self):
+        problem = LinearProblem()
+        problem.get_variable_constraint_graph()
+
+        unpickled = pickle.loads(pickle.dumps(problem))
+        assert unpickled._variable_constraint_graph is None
+        assert unpickled._objective_terms is None
+        assert unpickled._name_buffer == {}
+        assert problem._variable_constraint_graph is not None
+
+        vcg = unpickled.get_variable_constraint_graph()
+        assert set(vcg.nodes) == set(problem.get_variable_constraint_graph().nodes)
+
+    def test_unpickle_without_caches(self):
+        problem = LinearProblem()
+        state = problem.__getstate__()
+        for key in ("_vcg_arrays", "_objective_terms", "_features", "_feature_groups"):
+            del state[key]
+
+        unpickled = LinearProblem.__new__(LinearProblem)
+        unpickled.__setstate__(state)
+        vcg = unpickled.get_variable_constraint_graph()
+        assert set(vcg.nodes) == set(problem.get_variable_constraint_graph().nodes)
+        assert unpickled.get_features(groups=["counts"])
+        assert unpickled.get_features() == problem.get_features()
+
     def test_save_linear_model(self, tmp_path):
         problem = MockProblem()
         problem.save(tmp_path)
@@ -276,6 +333,23 @@ class TestSavingLoading:
             io_options={"symbolic_solver_labels": True},
         )
 
+    def test_save_without_symbolic_labels(self, tmp_path):
+        problem = MockProblem()
+        problem.save(tmp_path, symbolic_labels=False)
+
+        problem.model.write.assert_called_with(
+            str(tmp_path / "mock_problem.mps"),
+            io_options={"symbolic_solver_labels": False},
+        )
+
+    def test_save_drops_symbol_map(self, tmp_path):
+        problem = LinearProblem()
+        problem.save(tmp_path)
+        problem.save(tmp_path)
+
+        assert (tmp_path / "linear_problem.mps").exists()
+        assert not problem.model.solutions.symbol_map
+
     def test_save_extra_files(self, tmp_path):
         problem = LinearProblem()
         problem.save(tmp_path, params=True, features=True)
@@ -286,6 +360,26 @@ class TestSavingLoading:
         features_path = tmp_path / "linear_problem_features.json"
         assert features_path.exists()
 
+    def test_save_many(self, tmp_path):
+        problems = [
+            ProblemWithParameters(constr_coeffs=[1] * n, obj_coeffs=[2] * n)
+            for n in range(1, 4)
+        ]
+        save_many(problems, tmp_path, params=True, max_workers=2)
+
+        for n in range(1, 4):
+            assert (tmp_path / f"problem_with_params_{n}.mps").exists()
+            assert (tmp_path / f"problem_with_params_{n}_parameters.pkl").exists()
+
+    def test_features_cached_on_disk(self, tmp_path):
+        features = LinearProblem().get_features(tmp_path)
+        assert (tmp_path / "linear_problem_features.json").exists()
+
+        problem = LinearProblem()
+        problem._compute_features = MagicMock()
+        assert problem.get_features(tmp_path) == features
+        problem._compute_features.assert_not_called()
+
     def test_load_from_saved_params(self, tmp_path):
         constr_coeffs = list(range(1, 6))
         obj_coeffs = list(range(5, 10))